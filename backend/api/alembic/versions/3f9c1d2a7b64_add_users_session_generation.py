@@ -0,0 +1,26 @@
+"""add_users_session_generation
+
+Revision ID: 3f9c1d2a7b64
+Revises: fe70c78afdb7
+Create Date: 2026-10-18 09:12:41.218305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c1d2a7b64'
+down_revision: Union[str, None] = 'fe70c78afdb7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('session_generation', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'session_generation')
@@ -0,0 +1,41 @@
+"""add_user_listing_indexes
+
+Revision ID: 8b2e4f6a1c93
+Revises: 3f9c1d2a7b64
+Create Date: 2026-10-18 11:47:03.514920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4f6a1c93'
+down_revision: Union[str, None] = '3f9c1d2a7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQLite reflects the UUID id column as NUMERIC, whose affinity would turn
+# all-digit hex ids into numbers when batch mode copies the table
+USERS_REFLECT_ARGS = [sa.Column('id', sa.UUID(), primary_key=True)]
+
+
+def upgrade() -> None:
+    # Rows with no created_at would fall outside every keyset page
+    op.execute("UPDATE users SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    # Batch mode, since SQLite cannot ALTER a column's default in place
+    with op.batch_alter_table('users', reflect_args=USERS_REFLECT_ARGS) as batch_op:
+        batch_op.alter_column('created_at', server_default=sa.func.now())
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+    op.create_index('ix_profiles_type_user_id', 'profiles', ['type', 'user_id'], unique=False)
+    op.create_index(op.f('ix_student_profiles_grade_level'), 'student_profiles', ['grade_level'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_student_profiles_grade_level'), table_name='student_profiles')
+    op.drop_index('ix_profiles_type_user_id', table_name='profiles')
+    op.drop_index('ix_users_created_at_id', table_name='users')
+    with op.batch_alter_table('users', reflect_args=USERS_REFLECT_ARGS) as batch_op:
+        batch_op.alter_column('created_at', server_default=None)
@@ -0,0 +1,26 @@
+"""add_users_version
+
+Revision ID: c41d7e9f2a58
+Revises: 8b2e4f6a1c93
+Create Date: 2026-10-18 14:05:22.806117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e9f2a58'
+down_revision: Union[str, None] = '8b2e4f6a1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'version')
@@ -0,0 +1,59 @@
+"""store_uuids_as_binary
+
+Revision ID: d5a8e3b1f064
+Revises: c41d7e9f2a58
+Create Date: 2026-10-18 16:22:41.390572
+
+"""
+from typing import Sequence, Union
+from uuid import UUID
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a8e3b1f064'
+down_revision: Union[str, None] = 'c41d7e9f2a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Every UUID column, with how it was stored as text before: the old String
+# UUIDType wrote dashed strings, the postgresql UUID type wrote bare hex on SQLite
+UUID_COLUMNS = {
+    'users': {'id': str},
+    'profiles': {'id': lambda value: value.hex, 'user_id': str},
+    'student_profiles': {'id': lambda value: value.hex},
+    'teacher_profiles': {'id': lambda value: value.hex},
+    'parent_profiles': {'id': lambda value: value.hex},
+    'admin_profiles': {'id': lambda value: value.hex},
+    'parent_student_association': {'parent_id': lambda value: value.hex, 'student_id': lambda value: value.hex},
+}
+
+
+def _rewrite(convert) -> None:
+    bind = op.get_bind()
+    # PostgreSQL columns are already native uuid; only SQLite stores them as text
+    if bind.dialect.name != 'sqlite':
+        return
+    tables = set(sa.inspect(bind).get_table_names())
+    for table, columns in UUID_COLUMNS.items():
+        if table not in tables:
+            continue
+        for column, to_text in columns.items():
+            rows = bind.execute(sa.text(f'SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL')).all()
+            for (value,) in rows:
+                new_value = convert(value, to_text)
+                if new_value != value:
+                    bind.execute(
+                        sa.text(f'UPDATE {table} SET {column} = :new WHERE {column} = :old'),
+                        {'new': new_value, 'old': value}
+                    )
+
+
+def upgrade() -> None:
+    _rewrite(lambda value, to_text: value if isinstance(value, bytes) else UUID(value).bytes)
+
+
+def downgrade() -> None:
+    _rewrite(lambda value, to_text: to_text(UUID(bytes=value)) if isinstance(value, bytes) else value)
@@ -0,0 +1,57 @@
+"""key_parent_student_association
+
+Revision ID: e7c2a9d4b815
+Revises: d5a8e3b1f064
+Create Date: 2026-10-18 18:41:09.127354
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c2a9d4b815'
+down_revision: Union[str, None] = 'd5a8e3b1f064'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Matches UUIDType since d5a8e3b1f064: native uuid, 16 raw bytes on SQLite
+UUID_TYPE = sa.UUID().with_variant(sa.LargeBinary(16), 'sqlite')
+
+
+def upgrade() -> None:
+    # Rebuilt rather than altered so duplicate and half-null links can be
+    # dropped on the way, and so SQLite gets its primary key too
+    op.create_table('parent_student_association_keyed',
+    sa.Column('parent_id', UUID_TYPE, nullable=False),
+    sa.Column('student_id', UUID_TYPE, nullable=False),
+    sa.ForeignKeyConstraint(['parent_id'], ['parent_profiles.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['student_id'], ['student_profiles.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('parent_id', 'student_id', name='parent_student_association_pkey')
+    )
+    op.execute(
+        "INSERT INTO parent_student_association_keyed (parent_id, student_id) "
+        "SELECT DISTINCT parent_id, student_id FROM parent_student_association "
+        "WHERE parent_id IS NOT NULL AND student_id IS NOT NULL"
+    )
+    op.drop_table('parent_student_association')
+    op.rename_table('parent_student_association_keyed', 'parent_student_association')
+    op.create_index(op.f('ix_parent_student_association_student_id'), 'parent_student_association', ['student_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_parent_student_association_student_id'), table_name='parent_student_association')
+    op.create_table('parent_student_association_unkeyed',
+    sa.Column('parent_id', UUID_TYPE, nullable=True),
+    sa.Column('student_id', UUID_TYPE, nullable=True),
+    sa.ForeignKeyConstraint(['parent_id'], ['parent_profiles.id'], ),
+    sa.ForeignKeyConstraint(['student_id'], ['student_profiles.id'], )
+    )
+    op.execute(
+        "INSERT INTO parent_student_association_unkeyed (parent_id, student_id) "
+        "SELECT parent_id, student_id FROM parent_student_association"
+    )
+    op.drop_table('parent_student_association')
+    op.rename_table('parent_student_association_unkeyed', 'parent_student_association')
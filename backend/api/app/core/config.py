@@ -9,24 +9,99 @@ class Settings(BaseSettings):
     ENV_FILE: str = str(Path(__file__).parent.parent.parent / ".env")
     DEBUG: bool = True
     
+    # Server (python -m app.server). SERVER_WORKERS defaults to the CPU count;
+    # SERVER_RELOAD runs a single auto-reloading worker for development
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: Optional[int] = None
+    SERVER_RELOAD: bool = False
+    SERVER_PRELOAD: bool = False
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    SERVER_TIMEOUT_SECONDS: int = 60
+    SERVER_MAX_REQUESTS: int = 0
+
     # Database
     SQLALCHEMY_DATABASE_URL: str = "sqlite:///./app.db"
     DATABASE_URL: Optional[str] = None
     POSTGRES_USER: Optional[str] = None
     POSTGRES_PASSWORD: Optional[str] = None
     POSTGRES_DB: Optional[str] = None
-    
+
+    # Prepared statements cached per asyncpg connection. Behind PgBouncer in
+    # transaction pooling mode set this to 0 (statements then get unique
+    # names) and DB_POOL_MODE to "null"
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    # Read replica. Reads go to the primary for a while after a user's own
+    # writes, so they aren't served stale data while the replica catches up
+    DATABASE_REPLICA_URL: Optional[str] = None
+    DB_REPLICA_READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Database pool ("queue" for a pooled engine, "null" to open a connection per session)
+    DB_POOL_MODE: str = "queue"
+    DB_POOL_SIZE: int = 5
+    DB_POOL_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+
+    # Polymorphic profile loading for user reads ("joined" or "selectin")
+    PROFILE_POLYMORPHIC_LOADING: str = "joined"
+
     # Redis
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: Optional[str] = None
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 2.0
+    REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS: float = 2.0
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = 30
     
     # JWT
     JWT_SECRET_KEY: str = "your-secret-key"  # Change in production
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
-    
+
+    # Token revocation filter (per worker)
+    REVOCATION_FILTER_CAPACITY: int = 100000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    REVOCATION_FILTER_REBUILD_SECONDS: int = 900
+
+    # Password hashing (workers defaults to the CPU count)
+    PASSWORD_HASH_WORKERS: Optional[int] = None
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Authenticated user cache (TTL bounds how long a missed invalidation can go unnoticed)
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 30.0
+
+    # Guardian -> student id sets: in-process TTL, backed by Redis with a longer TTL
+    GUARDIAN_CACHE_MAX_SIZE: int = 10000
+    GUARDIAN_CACHE_TTL_SECONDS: float = 60.0
+    GUARDIAN_CACHE_REDIS_TTL_SECONDS: int = 3600
+
+    # Bulk user import
+    BULK_IMPORT_BATCH_SIZE: int = 1000
+    BULK_IMPORT_MAX_REPORTED_ERRORS: int = 1000
+
+    # Serialize response models directly with pydantic-core and plain
+    # responses with orjson, instead of re-validating and using stdlib json
+    FAST_JSON_RESPONSES: bool = False
+
+    # Metrics. Routes past METRICS_MAX_ROUTES share one "other" series;
+    # METRICS_STATUS_CLASSES reports 2xx/4xx/5xx instead of exact status codes
+    METRICS_ENABLED: bool = True
+    METRICS_MAX_ROUTES: int = 200
+    METRICS_STATUS_CLASSES: bool = False
+
+    # Bulk user export (rows fetched per server-side cursor round trip)
+    BULK_EXPORT_CHUNK_SIZE: int = 1000
+
+    # Primary key generator: "uuid7" (time-ordered) or "uuid4" (random)
+    ID_GENERATOR: str = "uuid7"
+
     # CORS
     CORS_ORIGINS: list[str] = ["*"]
     CORS_CREDENTIALS: bool = True
@@ -0,0 +1,27 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import Response, status
+
+# Clients may reuse the cached body but must revalidate it every time
+CACHE_CONTROL = "private, no-cache"
+
+def user_etag(user_id: UUID, version: int) -> str:
+    """Strong ETag for a user representation; includes the id because
+    /users/me serves different users at the same URL"""
+    return f'"{user_id.hex}-{version}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from collections import Counter
+from typing import Optional
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, WatchError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.user_cache import TTLCache
+from app.models.profiles import BaseProfile
+from app.models.relationships import parent_student_association
+
+logger = logging.getLogger(__name__)
+
+GUARDIAN_STUDENTS_KEY_PREFIX = "guardian-students:"
+# Bumped by every invalidation, so a load that started before it never caches
+GUARDIAN_GENERATION_KEY_PREFIX = "guardian-students-generation:"
+GUARDIAN_INVALIDATION_CHANNEL = "guardian-cache:invalidate"
+
+# Student user ids per guardian user id, as frozensets for O(1) membership checks
+guardian_students_cache = TTLCache(
+    maxsize=settings.GUARDIAN_CACHE_MAX_SIZE,
+    ttl=settings.GUARDIAN_CACHE_TTL_SECONDS
+)
+# Times this worker dropped each guardian's entry, and under None the times
+# it dropped them all. A load only fills the cache if these did not move,
+# so an invalidation that lands mid-load is not undone.
+_local_invalidations: Counter = Counter()
+
+def _local_generation(guardian_id: UUID) -> tuple:
+    return _local_invalidations[None], _local_invalidations[guardian_id]
+
+def _invalidate_local(guardian_id: UUID) -> None:
+    _local_invalidations[guardian_id] += 1
+    guardian_students_cache.invalidate(guardian_id)
+
+def _clear_local() -> None:
+    _local_invalidations[None] += 1
+    guardian_students_cache.clear()
+
+async def load_guardian_student_ids(db: AsyncSession, guardian_id: UUID) -> frozenset:
+    """Query the user ids of a guardian's students (links are keyed by profile id)"""
+    parents = BaseProfile.__table__.alias("parents")
+    students = BaseProfile.__table__.alias("students")
+    links = parent_student_association
+    result = await db.execute(
+        select(students.c.user_id)
+        .select_from(
+            parents
+            .join(links, links.c.parent_id == parents.c.id)
+            .join(students, students.c.id == links.c.student_id)
+        )
+        .filter(parents.c.user_id == guardian_id)
+    )
+    return frozenset(result.scalars())
+
+async def get_guardian_student_ids(db: AsyncSession, redis: Redis, guardian_id: UUID) -> frozenset:
+    """A guardian's student user ids: from this worker, then Redis, then the database"""
+    student_ids = guardian_students_cache.get(guardian_id)
+    if student_ids is not None:
+        return student_ids
+
+    local_generation = _local_generation(guardian_id)
+    key = f"{GUARDIAN_STUDENTS_KEY_PREFIX}{guardian_id}"
+    generation_key = f"{GUARDIAN_GENERATION_KEY_PREFIX}{guardian_id}"
+    try:
+        cached, generation = await redis.mget(key, generation_key)
+    except RedisError:
+        # The set is still loaded, but with no generation it is not cached
+        return await load_guardian_student_ids(db, guardian_id)
+    if cached is not None:
+        student_ids = frozenset(UUID(value) for value in cached.split(",") if value)
+    else:
+        student_ids = await load_guardian_student_ids(db, guardian_id)
+        if not await _store_guardian_student_ids(redis, guardian_id, generation, student_ids):
+            # Invalidated mid-load, or not cached in Redis: good for this request only
+            return student_ids
+    if _local_generation(guardian_id) == local_generation:
+        guardian_students_cache.set(guardian_id, student_ids)
+    return student_ids
+
+async def _store_guardian_student_ids(
+    redis: Redis,
+    guardian_id: UUID,
+    generation: Optional[str],
+    student_ids: frozenset
+) -> bool:
+    """Cache a loaded set in Redis unless the guardian was invalidated since
+    the load began; the stale set would otherwise outlive the invalidation.
+
+    Returns False if the set was invalidated or could not be written, in
+    which case it should not be cached locally either.
+    """
+    generation_key = f"{GUARDIAN_GENERATION_KEY_PREFIX}{guardian_id}"
+    try:
+        async with redis.pipeline() as pipe:
+            await pipe.watch(generation_key)
+            if await pipe.get(generation_key) != generation:
+                return False
+            pipe.multi()
+            pipe.set(
+                f"{GUARDIAN_STUDENTS_KEY_PREFIX}{guardian_id}",
+                ",".join(str(student_id) for student_id in student_ids),
+                ex=settings.GUARDIAN_CACHE_REDIS_TTL_SECONDS
+            )
+            await pipe.execute()
+    except WatchError:
+        # Invalidated between the check and the write
+        return False
+    except RedisError:
+        logger.warning("Could not cache students for guardian %s", guardian_id)
+        return False
+    return True
+
+async def invalidate_guardian(redis: Redis, guardian_id: UUID) -> None:
+    """Drop a guardian's student set everywhere after their links change"""
+    _invalidate_local(guardian_id)
+    generation_key = f"{GUARDIAN_GENERATION_KEY_PREFIX}{guardian_id}"
+    try:
+        async with redis.pipeline() as pipe:
+            pipe.incr(generation_key)
+            # Outlives any load that could have read the old generation
+            pipe.expire(generation_key, settings.GUARDIAN_CACHE_REDIS_TTL_SECONDS)
+            pipe.delete(f"{GUARDIAN_STUDENTS_KEY_PREFIX}{guardian_id}")
+            await pipe.execute()
+        await redis.publish(GUARDIAN_INVALIDATION_CHANNEL, str(guardian_id))
+    except RedisError:
+        # Other workers still drop the entry once its TTL runs out
+        logger.warning("Could not broadcast cache invalidation for guardian %s", guardian_id)
+
+async def listen_for_guardian_invalidations(redis: Redis, retry_delay: float = 1.0) -> None:
+    """Apply guardian invalidations broadcast by other workers until cancelled"""
+    while True:
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(GUARDIAN_INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    _invalidate_local(UUID(message["data"]))
+        except RedisError:
+            # Messages may have been missed while disconnected
+            _clear_local()
+            logger.warning("Guardian cache invalidation listener lost Redis, retrying")
+            await asyncio.sleep(retry_delay)
+        finally:
+            await pubsub.aclose()
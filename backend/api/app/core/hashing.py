@@ -0,0 +1,78 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+from app.core.metrics import Counter, Histogram
+
+class HasherSaturatedError(Exception):
+    """Raised when the password hashing queue is full"""
+
+class PasswordHasher:
+    """Runs bcrypt work on a bounded thread pool so it never blocks the event loop.
+
+    bcrypt releases the GIL while hashing, so throughput scales with the
+    number of worker threads up to the number of cores.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: int = 0) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = self.max_workers + max_queue
+        self.pending = 0
+        self.hash_seconds = Histogram()
+        self.queue_wait_seconds = Histogram()
+        self.rejected = Counter()
+        # Created on first use, so the hasher outlives any one app lifespan
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func in the pool, rejecting immediately if the queue is full"""
+        if self.pending >= self.max_pending:
+            self.rejected.inc()
+            raise HasherSaturatedError("Password hashing queue is full")
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash"
+            )
+        self.pending += 1
+        loop = asyncio.get_running_loop()
+        try:
+            result, queue_wait, duration = await loop.run_in_executor(
+                self._executor, _timed_call, time.perf_counter(), func, args
+            )
+        finally:
+            self.pending -= 1
+        # Observed on the loop thread so the histograms need no locking
+        self.queue_wait_seconds.observe(queue_wait)
+        self.hash_seconds.observe(duration)
+        return result
+
+    def get_stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected.value,
+            "hash_seconds": self.hash_seconds.snapshot(),
+            "queue_wait_seconds": self.queue_wait_seconds.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        """Release the worker threads without blocking; the next run starts a new pool"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+def _timed_call(submitted: float, func: Callable[..., Any], args: tuple) -> tuple:
+    started = time.perf_counter()
+    result = func(*args)
+    return result, started - submitted, time.perf_counter() - started
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
@@ -0,0 +1,140 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from redis.asyncio import Redis
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import MetricFamily
+
+# Per-request query and Redis counts come out as small integers
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+@dataclass
+class RequestMetrics:
+    db_statements: int = 0
+    db_seconds: float = 0.0
+    redis_calls: int = 0
+
+# Set by MetricsMiddleware for the duration of each request
+current_request_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "current_request_metrics", default=None
+)
+
+http_requests = MetricFamily(
+    "http_requests_total", "HTTP requests by route and status", "counter",
+    ("method", "route", "status"), max_series=settings.METRICS_MAX_ROUTES * 8
+)
+http_request_duration = MetricFamily(
+    "http_request_duration_seconds", "HTTP request latency", "histogram",
+    ("method", "route"), max_series=settings.METRICS_MAX_ROUTES
+)
+http_requests_in_progress = MetricFamily(
+    "http_requests_in_progress", "HTTP requests currently being served", "gauge"
+)
+http_request_db_statements = MetricFamily(
+    "http_request_db_statements", "Database statements per HTTP request", "histogram",
+    ("method", "route"), max_series=settings.METRICS_MAX_ROUTES, buckets=COUNT_BUCKETS
+)
+http_request_db_seconds = MetricFamily(
+    "http_request_db_seconds", "Time spent in database statements per HTTP request", "histogram",
+    ("method", "route"), max_series=settings.METRICS_MAX_ROUTES
+)
+http_request_redis_calls = MetricFamily(
+    "http_request_redis_calls", "Redis commands per HTTP request", "histogram",
+    ("method", "route"), max_series=settings.METRICS_MAX_ROUTES, buckets=COUNT_BUCKETS
+)
+db_statement_duration = MetricFamily(
+    "db_statement_duration_seconds", "Database statement latency", "histogram"
+)
+redis_commands = MetricFamily(
+    "redis_commands_total", "Redis commands by command name", "counter",
+    ("command",), max_series=100
+)
+
+FAMILIES = [
+    http_requests,
+    http_request_duration,
+    http_requests_in_progress,
+    http_request_db_statements,
+    http_request_db_seconds,
+    http_request_redis_calls,
+    db_statement_duration,
+    redis_commands,
+]
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_started
+    db_statement_duration.labels().observe(elapsed)
+    metrics = current_request_metrics.get()
+    if metrics is not None:
+        metrics.db_statements += 1
+        metrics.db_seconds += elapsed
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement on a (sync) engine; safe to call more than once"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+class InstrumentedRedis(Redis):
+    """Redis client that counts commands, per request and by name"""
+
+    async def execute_command(self, *args, **options):
+        redis_commands.labels(str(args[0]).upper()).inc()
+        metrics = current_request_metrics.get()
+        if metrics is not None:
+            metrics.redis_calls += 1
+        return await super().execute_command(*args, **options)
+
+class MetricsMiddleware:
+    """Records latency, status, and DB/Redis usage per route template.
+
+    Routes are labelled by their path template (e.g. /users/{user_id}), so
+    the number of series is bounded by the number of routes. Plain ASGI
+    rather than BaseHTTPMiddleware, to keep per-request overhead small.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics = RequestMetrics()
+        token = current_request_metrics.set(metrics)
+        in_progress = http_requests_in_progress.labels()
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            current_request_metrics.reset(token)
+
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "unmatched"))
+            status = f"{status_code // 100}xx" if settings.METRICS_STATUS_CLASSES else str(status_code)
+            http_requests.labels(*labels, status).inc()
+            http_request_duration.labels(*labels).observe(elapsed)
+            http_request_db_statements.labels(*labels).observe(metrics.db_statements)
+            http_request_db_seconds.labels(*labels).observe(metrics.db_seconds)
+            http_request_redis_calls.labels(*labels).observe(metrics.redis_calls)
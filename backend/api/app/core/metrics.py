@@ -0,0 +1,135 @@
+from bisect import bisect_left
+from typing import Sequence
+
+# Seconds; tuned for things that should normally finish in well under a second
+DEFAULT_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+class Counter:
+    """Monotonically increasing counter"""
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus-style cumulative buckets"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        """Return count, sum and cumulative bucket counts keyed by upper bound"""
+        cumulative = {}
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = self.count
+        return {"count": self.count, "sum": self.sum, "buckets": cumulative}
+
+class Gauge:
+    """Value that can go up and down"""
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: int = 1) -> None:
+        self.value -= amount
+
+OVERFLOW_LABEL = "other"
+
+class MetricFamily:
+    """A named metric with one child per combination of label values.
+
+    Once max_series label combinations exist, new ones share a single
+    series labelled "other", so unbounded inputs can't grow memory or the
+    scrape without limit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        kind: str,
+        labelnames: Sequence[str] = (),
+        max_series: int = 1000,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self.buckets = buckets
+        self._children = {}
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(self._children) >= self.max_series:
+                values = (OVERFLOW_LABEL,) * len(self.labelnames)
+                child = self._children.get(values)
+            if child is None:
+                child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        if self.kind == "counter":
+            return Counter()
+        if self.kind == "gauge":
+            return Gauge()
+        return Histogram(self.buckets)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in self._children.items():
+            labels = dict(zip(self.labelnames, values))
+            if self.kind == "histogram":
+                lines.extend(_histogram_samples(self.name, labels, child.snapshot()))
+            else:
+                lines.append(f"{self.name}{_format_labels(labels)} {child.value}")
+        return lines
+
+def render_stats(prefix: str, stats: dict) -> list:
+    """Render a get_stats()-style dict: numbers as gauges, snapshots as histograms"""
+    lines = []
+    for key, value in stats.items():
+        name = f"{prefix}_{key}"
+        if isinstance(value, dict) and "buckets" in value:
+            lines += [f"# TYPE {name} histogram", *_histogram_samples(name, {}, value)]
+        elif isinstance(value, (int, float)):
+            lines += [f"# TYPE {name} gauge", f"{name} {float(value)}"]
+    return lines
+
+def _histogram_samples(name: str, labels: dict, snapshot: dict) -> list:
+    lines = [
+        f"{name}_bucket{_format_labels({**labels, 'le': bound})} {count}"
+        for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{_format_labels(labels)} {snapshot['sum']}")
+    lines.append(f"{name}_count{_format_labels(labels)} {snapshot['count']}")
+    return lines
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
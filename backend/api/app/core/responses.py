@@ -0,0 +1,52 @@
+from typing import Any, Optional
+
+import pydantic_core
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+
+from app.core.config import settings
+
+class PydanticJSONResponse(Response):
+    """Serializes pydantic models (or lists of them) straight to JSON bytes
+    with pydantic-core, skipping FastAPI's re-validation and jsonable_encoder"""
+    media_type = "application/json"
+
+    def __init__(self, content: Any, status_code: int = 200, exclude_unset: bool = False) -> None:
+        self.exclude_unset = exclude_unset
+        super().__init__(content, status_code=status_code)
+
+    def render(self, content: Any) -> bytes:
+        if self.exclude_unset:
+            return type(content).__pydantic_serializer__.to_json(content, exclude_unset=True)
+        return pydantic_core.to_json(content)
+
+def default_response_class() -> type[JSONResponse]:
+    """orjson for plain dict and list responses in fast mode"""
+    return ORJSONResponse if settings.FAST_JSON_RESPONSES else JSONResponse
+
+def model_response(
+    content: Any,
+    status_code: int = 200,
+    response: Optional[Response] = None,
+    exclude_unset: bool = False
+) -> Any:
+    """Return a response model the fastest way the current mode allows.
+
+    With FAST_JSON_RESPONSES off the model is returned as-is and FastAPI
+    validates and encodes it against the route's response_model as usual.
+    With it on, the model is already valid, so it is serialized once and
+    returned as a finished response. The route's status_code, and headers
+    set on the injected Response, do not apply to a returned Response, so
+    pass them here.
+
+    exclude_unset serializes only the fields set on the model, for sparse
+    fieldsets. FastAPI would reject such a partial model against the full
+    response_model, so it is always returned as a finished response.
+    """
+    if settings.FAST_JSON_RESPONSES or exclude_unset:
+        fast = PydanticJSONResponse(content, status_code=status_code, exclude_unset=exclude_unset)
+        if response is not None:
+            for key, value in response.headers.items():
+                if key not in ("content-length", "content-type"):
+                    fast.headers.append(key, value)
+        return fast
+    return content
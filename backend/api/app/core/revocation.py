@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import math
+import secrets
+import time
+from hashlib import blake2b
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CHANNEL = "token-revocations"
+REVOCATION_KEY_PREFIX = "revoked:"
+
+class BloomFilter:
+    """Fixed-size Bloom filter for string keys"""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+def new_filter() -> BloomFilter:
+    return BloomFilter(
+        capacity=settings.REVOCATION_FILTER_CAPACITY,
+        error_rate=settings.REVOCATION_FILTER_ERROR_RATE
+    )
+
+def new_jti() -> str:
+    """Short random token id used as the revocation key"""
+    return secrets.token_urlsafe(12)
+
+# Revoked jtis known to this worker. A miss means "not revoked" without
+# asking Redis; a hit is confirmed against Redis to rule out false positives.
+revocation_filter = new_filter()
+filter_skips = Counter()
+redis_checks = Counter()
+false_positives = Counter()
+
+async def revoke_token(redis: Redis, jti: str, expires_at: float) -> None:
+    """Revoke a token until it would have expired anyway"""
+    ttl = int(expires_at - time.time()) + 1
+    if ttl <= 0:
+        return
+    await redis.set(f"{REVOCATION_KEY_PREFIX}{jti}", "1", ex=ttl)
+    revocation_filter.add(jti)
+    await redis.publish(REVOCATION_CHANNEL, jti)
+
+async def is_token_revoked(redis: Redis, jti: str) -> bool:
+    if jti not in revocation_filter:
+        filter_skips.inc()
+        return False
+    redis_checks.inc()
+    revoked = bool(await redis.exists(f"{REVOCATION_KEY_PREFIX}{jti}"))
+    if not revoked:
+        false_positives.inc()
+    return revoked
+
+async def rebuild_revocation_filter(redis: Redis) -> None:
+    """Replace the local filter with the revocations currently in Redis.
+
+    Also drops expired entries, which a Bloom filter cannot remove on its own.
+    """
+    global revocation_filter
+    rebuilt = new_filter()
+    prefix_length = len(REVOCATION_KEY_PREFIX)
+    async for key in redis.scan_iter(match=f"{REVOCATION_KEY_PREFIX}*", count=1000):
+        rebuilt.add(key[prefix_length:])
+    revocation_filter = rebuilt
+
+async def listen_for_revocations(redis: Redis, retry_delay: float = 1.0) -> None:
+    """Keep the local filter in sync with revocations from other workers until cancelled"""
+    while True:
+        pubsub = redis.pubsub()
+        try:
+            # Subscribe before loading so nothing revoked during the scan is missed
+            await pubsub.subscribe(REVOCATION_CHANNEL)
+            await rebuild_revocation_filter(redis)
+            next_rebuild = time.monotonic() + settings.REVOCATION_FILTER_REBUILD_SECONDS
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None:
+                    revocation_filter.add(message["data"])
+                if time.monotonic() >= next_rebuild:
+                    await rebuild_revocation_filter(redis)
+                    next_rebuild = time.monotonic() + settings.REVOCATION_FILTER_REBUILD_SECONDS
+        except RedisError:
+            logger.warning("Token revocation listener lost Redis, retrying")
+            await asyncio.sleep(retry_delay)
+        finally:
+            await pubsub.aclose()
+
+def get_revocation_stats() -> dict:
+    return {
+        "filter_entries": revocation_filter.count,
+        "filter_bytes": len(revocation_filter.bits),
+        "filter_skips": filter_skips.value,
+        "redis_checks": redis_checks.value,
+        "false_positives": false_positives.value,
+    }
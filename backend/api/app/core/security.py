@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta, UTC
 from typing import Any, Union, Optional
 from uuid import UUID
@@ -7,19 +8,48 @@ from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from redis import Redis
+from redis.asyncio import Redis
 
 from app.core.config import settings
+from app.core.hashing import password_hasher, HasherSaturatedError
+from app.core.user_cache import user_cache
+from app.core.revocation import new_jti, is_token_revoked
 from app.db.session import get_db, get_redis
 from app.models.user import User
+from app.models.profiles import BaseProfile
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-# In-memory token blacklist (replace with Redis in production)
-token_blacklist = set()
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Immutable snapshot of the user behind a token, safe to share across requests"""
+    id: UUID
+    username: str
+    email: str
+    is_active: bool
+    # Polymorphic profile type ("admin", "student", ...), None without a profile
+    role: Optional[str] = None
+    session_generation: int = 0
+    version: int = 1
 
-def create_access_token(user_id: UUID, expires_delta: Optional[timedelta] = None) -> str:
+    @classmethod
+    def from_model(cls, user: User, role: Optional[str] = None) -> "AuthenticatedUser":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            is_active=user.is_active,
+            role=role,
+            session_generation=user.session_generation or 0,
+            version=user.version or 1
+        )
+
+def create_access_token(
+    user_id: UUID,
+    expires_delta: Optional[timedelta] = None,
+    generation: int = 0
+) -> str:
     """Create access token"""
     if expires_delta:
         expire = datetime.now(UTC) + expires_delta
@@ -29,17 +59,21 @@ def create_access_token(user_id: UUID, expires_delta: Optional[timedelta] = None
     to_encode = {
         "exp": expire,
         "sub": str(user_id),
-        "type": "access"
+        "type": "access",
+        "jti": new_jti(),
+        "gen": generation
     }
     return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
-def create_refresh_token(user_id: UUID) -> str:
+def create_refresh_token(user_id: UUID, generation: int = 0) -> str:
     """Create refresh token"""
     expire = datetime.now(UTC) + timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode = {
         "exp": expire,
         "sub": str(user_id),
-        "type": "refresh"
+        "type": "refresh",
+        "jti": new_jti(),
+        "gen": generation
     }
     return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
@@ -51,38 +85,52 @@ def get_password_hash(password: str) -> str:
     """Generate password hash"""
     return pwd_context.hash(password)
 
-def decode_access_token(token: str) -> UUID:
-    """Decode and validate access token"""
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash without blocking the event loop"""
+    return await _run_hasher(pwd_context.verify, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate password hash without blocking the event loop"""
+    return await _run_hasher(pwd_context.hash, password)
+
+async def _run_hasher(func, *args):
+    try:
+        return await password_hasher.run(func, *args)
+    except HasherSaturatedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+def decode_token(token: str, token_type: str) -> dict:
+    """Decode a token and validate its type and required claims"""
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        if payload.get("type") != "access":
-            raise ValueError("Not an access token")
-        user_id = payload.get("sub")
-        if user_id is None:
+        if payload.get("type") != token_type:
+            raise ValueError(f"Expected a {token_type} token")
+        if payload.get("sub") is None:
             raise ValueError("Token missing user ID")
-        return UUID(user_id)
-    except (JWTError, ValueError) as e:
+        if payload.get("jti") is None:
+            raise ValueError("Token missing jti")
+        return payload
+    except JWTError as e:
         raise ValueError(str(e))
 
+def decode_access_token(token: str) -> UUID:
+    """Decode and validate access token"""
+    return UUID(decode_token(token, "access")["sub"])
+
 def decode_refresh_token(token: str) -> UUID:
     """Decode and validate refresh token"""
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        if payload.get("type") != "refresh":
-            raise ValueError("Not a refresh token")
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise ValueError("Token missing user ID")
-        return UUID(user_id)
-    except (JWTError, ValueError) as e:
-        raise ValueError(str(e))
+    return UUID(decode_token(token, "refresh")["sub"])
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db),
     redis: Redis = Depends(get_redis)
-) -> User:
-    """Get current user from token"""
+) -> AuthenticatedUser:
+    """Get current user from token, served from the user cache when possible"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -90,22 +138,40 @@ async def get_current_user(
     )
     
     try:
-        # Check if token is blacklisted
-        if await redis.get(f"blacklist:{token}"):
+        claims = decode_token(token, "access")
+        if await is_token_revoked(redis, claims["jti"]):
             raise credentials_exception
 
-        user_id = decode_access_token(token)
-        result = await db.execute(
-            select(User).filter(User.id == user_id)
-        )
-        user = result.scalar_one_or_none()
-        
+        user_id = UUID(claims["sub"])
+        user = user_cache.get(user_id)
         if user is None:
+            # Resolve the profile type in the same round trip as the user
+            result = await db.execute(
+                select(User, BaseProfile.type)
+                .outerjoin(BaseProfile, BaseProfile.user_id == User.id)
+                .filter(User.id == user_id)
+            )
+            row = result.one_or_none()
+            if row is None:
+                raise credentials_exception
+            user = AuthenticatedUser.from_model(row[0], role=row[1])
+            user_cache.set(user_id, user)
+
+        if not user.is_active or claims.get("gen", 0) != user.session_generation:
             raise credentials_exception
         return user
     except ValueError:
         raise credentials_exception
 
-def blacklist_token(token: str) -> None:
-    """Add a token to the blacklist"""
-    token_blacklist.add(token) 
\ No newline at end of file
+def require_role(*roles: str):
+    """Dependency factory that only admits users whose profile type is in roles"""
+    async def dependency(
+        current_user: AuthenticatedUser = Depends(get_current_user)
+    ) -> AuthenticatedUser:
+        if current_user.role not in roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+        return current_user
+    return dependency
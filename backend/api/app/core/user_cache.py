@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+USER_INVALIDATION_CHANNEL = "user-cache:invalidate"
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire after a fixed TTL"""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict = OrderedDict()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            self.misses.inc()
+            return None
+        expires_at, value = item
+        if expires_at <= self._clock():
+            del self._data[key]
+            self.misses.inc()
+            return None
+        self._data.move_to_end(key)
+        self.hits.inc()
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        self._data[key] = (self._clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def get_stats(self) -> dict:
+        lookups = self.hits.value + self.misses.value
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits.value,
+            "misses": self.misses.value,
+            "hit_ratio": self.hits.value / lookups if lookups else 0.0,
+        }
+
+# Resolved users for get_current_user, keyed by user id
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+async def invalidate_user(redis: Redis, user_id: UUID) -> None:
+    """Drop a user from this worker's cache and tell the other workers to do the same"""
+    user_cache.invalidate(user_id)
+    try:
+        await redis.publish(USER_INVALIDATION_CHANNEL, str(user_id))
+    except RedisError:
+        # Other workers still drop the entry once its TTL runs out
+        logger.warning("Could not broadcast cache invalidation for user %s", user_id)
+
+async def listen_for_invalidations(redis: Redis, retry_delay: float = 1.0) -> None:
+    """Apply invalidations broadcast by other workers until cancelled"""
+    while True:
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(USER_INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    user_cache.invalidate(UUID(message["data"]))
+        except RedisError:
+            # Messages may have been missed while disconnected
+            user_cache.clear()
+            logger.warning("User cache invalidation listener lost Redis, retrying")
+            await asyncio.sleep(retry_delay)
+        finally:
+            await pubsub.aclose()
@@ -0,0 +1,53 @@
+from typing import Optional
+from sqlalchemy import Select, select
+from sqlalchemy.orm import joinedload, selectinload, with_polymorphic
+
+from app.core.config import settings
+from app.models.user import User
+from app.models.profiles import BaseProfile, StudentProfile, TeacherProfile, ParentProfile, AdminProfile
+
+PROFILE_SUBCLASSES = [StudentProfile, TeacherProfile, ParentProfile, AdminProfile]
+
+def profile_loader_option(mode: Optional[str] = None):
+    """Loader option that eagerly loads User.profile as its concrete subtype.
+
+    "joined" fetches the user, base profile and every subtype table in one
+    LEFT OUTER JOIN query, which suits single-user reads. "selectin" loads
+    users first, then profiles and each subtype with one IN query apiece,
+    which keeps rows narrow for large rosters.
+    """
+    mode = mode or settings.PROFILE_POLYMORPHIC_LOADING
+    if mode == "joined":
+        profile = with_polymorphic(BaseProfile, PROFILE_SUBCLASSES, flat=True)
+        return joinedload(User.profile.of_type(profile)).undefer_group("iep")
+    if mode == "selectin":
+        return selectinload(User.profile).selectin_polymorphic(PROFILE_SUBCLASSES).undefer_group("iep")
+    raise ValueError(f"Unknown profile loading mode: {mode}")
+
+def select_users_with_profiles(mode: Optional[str] = None) -> Select:
+    """Select users with their fully typed profiles"""
+    return select(User).options(profile_loader_option(mode))
+
+# Columns for user listings; subtype columns other than grade_level are left out
+USER_LISTING_COLUMNS = [
+    User.__table__.c.id,
+    User.__table__.c.username,
+    User.__table__.c.email,
+    User.__table__.c.is_active,
+    User.__table__.c.created_at,
+    BaseProfile.__table__.c.type.label("role"),
+    BaseProfile.__table__.c.first_name,
+    BaseProfile.__table__.c.last_name,
+    StudentProfile.__table__.c.grade_level,
+]
+
+def select_user_listing(columns: Optional[list] = None) -> Select:
+    """Select flat listing rows as plain tuples, bypassing the ORM identity map"""
+    users = User.__table__
+    profiles = BaseProfile.__table__
+    students = StudentProfile.__table__
+    return select(*(columns or USER_LISTING_COLUMNS)).select_from(
+        users
+        .outerjoin(profiles, profiles.c.user_id == users.c.id)
+        .outerjoin(students, students.c.id == profiles.c.id)
+    )
@@ -0,0 +1,18 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+def encode_cursor(created_at: datetime, user_id: UUID) -> str:
+    """Opaque cursor for the row a page ended on"""
+    payload = json.dumps([created_at.isoformat(), str(user_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    """Inverse of encode_cursor; raises ValueError for anything it didn't produce"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, user_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), UUID(user_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
@@ -0,0 +1,153 @@
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy import Row, Select, select
+
+from app.db.loading import USER_LISTING_COLUMNS, select_user_listing
+from app.models.user import User
+from app.models.profiles import BaseProfile, StudentProfile, TeacherProfile, ParentProfile, AdminProfile
+from app.schemas.user import (
+    AdminProfileResponse,
+    ParentProfileResponse,
+    StudentProfileResponse,
+    TeacherProfileResponse,
+    UserListItem,
+    UserWithProfileResponse
+)
+
+def _subtype_fields(model) -> tuple:
+    return tuple(name for name in model.model_fields if name not in ("id", "type", "first_name", "last_name"))
+
+# Profile type -> (response model, subtype table, subtype-specific fields)
+PROFILE_READ_MODELS = {
+    profile_type: (model, table, _subtype_fields(model))
+    for profile_type, model, table in [
+        ("student", StudentProfileResponse, StudentProfile.__table__),
+        ("teacher", TeacherProfileResponse, TeacherProfile.__table__),
+        ("parent", ParentProfileResponse, ParentProfile.__table__),
+        ("admin", AdminProfileResponse, AdminProfile.__table__),
+    ]
+}
+
+# Large student columns, only fetched when a caller names them in ?fields=
+HEAVY_PROFILE_FIELDS = ("iep_summary", "accommodations", "iep_goals")
+
+USER_FIELDS = ("id", "username", "email", "is_active")
+PROFILE_FIELDS = ("id", "first_name", "last_name") + tuple(
+    name for _, _, fields in PROFILE_READ_MODELS.values() for name in fields
+)
+ALL_DETAIL_FIELDS = USER_FIELDS + tuple(f"profile.{name}" for name in PROFILE_FIELDS)
+DEFAULT_DETAIL_FIELDS = tuple(
+    name for name in ALL_DETAIL_FIELDS if name.removeprefix("profile.") not in HEAVY_PROFILE_FIELDS
+)
+
+# Listing fields: the flat listing columns plus the student's IEP columns
+LISTING_COLUMNS = {
+    column.name: column
+    for column in USER_LISTING_COLUMNS + [
+        StudentProfile.__table__.c[name]
+        for name in ("has_iep", "iep_summary", "accommodations", "iep_goals", "last_iep_review")
+    ]
+}
+# IEP details are listed for admins only
+LISTING_FIELDS = {
+    "admin": tuple(LISTING_COLUMNS),
+    "teacher": tuple(name for name in LISTING_COLUMNS if name not in HEAVY_PROFILE_FIELDS),
+}
+# Teachers only list students, so they get a roster by default
+DEFAULT_LISTING_FIELDS = {
+    "admin": tuple(column.name for column in USER_LISTING_COLUMNS),
+    "teacher": ("id", "username", "first_name", "last_name", "grade_level", "has_iep"),
+}
+
+def parse_fields(
+    value: Optional[str],
+    allowed: Sequence[str],
+    default: Sequence[str],
+    known: Sequence[str] = ()
+) -> tuple:
+    """Parse a comma-separated ?fields= value into allowed names, in their
+    canonical order so each fieldset always compiles to the same statement.
+
+    Without a value the default applies. "profile" stands for the default
+    profile fields. Raises PermissionError on a known name the caller may
+    not see, and ValueError on an unknown name.
+    """
+    if not value:
+        return tuple(default)
+    requested = set()
+    for name in value.split(","):
+        name = name.strip()
+        if name == "profile" and "profile.id" in allowed:
+            requested.update(field for field in default if field.startswith("profile."))
+        elif name in allowed:
+            requested.add(name)
+        elif name in known:
+            raise PermissionError(f"Not authorized to request field: {name}")
+        elif name:
+            raise ValueError(f"Unknown field: {name}")
+    return tuple(name for name in allowed if name in requested)
+
+def _profile_fields(fields: Sequence[str]) -> set:
+    return {name.removeprefix("profile.") for name in fields if name.startswith("profile.")}
+
+def select_user_with_profile(fields: Sequence[str] = ALL_DETAIL_FIELDS) -> Select:
+    """One row per user with the requested user, base profile and subtype columns.
+
+    Subtype tables none of whose columns were requested are not joined, and
+    unrequested columns are never fetched.
+    """
+    users = User.__table__
+    profiles = BaseProfile.__table__
+    # id and version are always needed for the ETag
+    columns = [users.c.id, users.c.version]
+    columns.extend(users.c[name] for name in USER_FIELDS if name in fields and name != "id")
+    joined = users
+    profile_fields = _profile_fields(fields)
+    if profile_fields:
+        columns.extend([profiles.c.id.label("profile_id"), profiles.c.type.label("profile_type")])
+        columns.extend(profiles.c[name] for name in ("first_name", "last_name") if name in profile_fields)
+        joined = joined.outerjoin(profiles, profiles.c.user_id == users.c.id)
+        for _, table, subtype_fields in PROFILE_READ_MODELS.values():
+            wanted = [name for name in subtype_fields if name in profile_fields]
+            if wanted:
+                columns.extend(table.c[name] for name in wanted)
+                joined = joined.outerjoin(table, table.c.id == profiles.c.id)
+    return select(*columns).select_from(joined)
+
+def user_with_profile(row: Row, fields: Sequence[str] = ALL_DETAIL_FIELDS) -> UserWithProfileResponse:
+    """Map a select_user_with_profile() row to the response model.
+
+    The columns are typed, so the values already satisfy the schema and
+    model_construct skips validation; no ORM instances are built either.
+    Only the requested fields are set, so serializing with exclude_unset
+    leaves the rest out.
+    """
+    mapping = row._mapping
+    values = {name: mapping[name] for name in USER_FIELDS if name in fields}
+    profile_fields = _profile_fields(fields)
+    if profile_fields:
+        profile = None
+        read_model = PROFILE_READ_MODELS.get(row.profile_type)
+        if read_model is not None:
+            model, _, subtype_fields = read_model
+            profile_values = {"type": row.profile_type}
+            if "id" in profile_fields:
+                profile_values["id"] = row.profile_id
+            for name in ("first_name", "last_name") + subtype_fields:
+                if name in profile_fields:
+                    profile_values[name] = mapping[name]
+            profile = model.model_construct(**profile_values)
+        values["profile"] = profile
+    return UserWithProfileResponse.model_construct(**values)
+
+def select_listing(fields: Sequence[str]) -> Select:
+    """Listing rows with the requested columns, plus the keyset cursor columns"""
+    names = dict.fromkeys(("id", "created_at") + tuple(fields))
+    return select_user_listing([LISTING_COLUMNS[name] for name in names])
+
+def user_list_items(rows: Iterable[Row], fields: Sequence[str]) -> list[UserListItem]:
+    """Map listing rows to items carrying only the requested fields"""
+    return [
+        UserListItem.model_construct(**{name: row._mapping[name] for name in fields})
+        for row in rows
+    ]
@@ -0,0 +1,53 @@
+import logging
+from typing import AsyncGenerator
+from uuid import UUID
+
+from fastapi import Depends
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import AuthenticatedUser, get_current_user
+from app.db import session as db_session
+from app.db.session import get_db, get_redis
+
+logger = logging.getLogger(__name__)
+
+RECENT_WRITE_KEY_PREFIX = "recent-write:"
+
+async def mark_recent_write(redis: Redis, user_id: UUID) -> None:
+    """Pin a user's reads to the primary until the replica has caught up with their write"""
+    if db_session.replica_engine is None:
+        return
+    try:
+        await redis.set(
+            f"{RECENT_WRITE_KEY_PREFIX}{user_id}",
+            1,
+            px=int(settings.DB_REPLICA_READ_YOUR_WRITES_SECONDS * 1000)
+        )
+    except RedisError:
+        logger.warning("Could not record recent write for user %s", user_id)
+
+async def reads_from_replica(redis: Redis, user_id: UUID) -> bool:
+    """Whether a user's reads can go to the replica: there is one, and they didn't write recently"""
+    if db_session.replica_engine is None:
+        return False
+    try:
+        return not await redis.exists(f"{RECENT_WRITE_KEY_PREFIX}{user_id}")
+    except RedisError:
+        # Without the marker we can't rule out a recent write, so stay consistent
+        return False
+
+async def get_read_db(
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Get a session for read-only handlers: a replica session when possible,
+    otherwise the request's primary session from get_db"""
+    if not await reads_from_replica(redis, current_user.id):
+        yield db
+        return
+    async with db_session.ReplicaSessionLocal() as session:
+        yield session
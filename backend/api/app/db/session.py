@@ -1,22 +1,88 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from redis import Redis
-from sqlalchemy.pool import NullPool
+import logging
+import orjson
+from typing import AsyncGenerator, Optional
+from uuid import uuid4
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker, AsyncEngine
+from redis.asyncio import Redis, ConnectionPool
+from redis.exceptions import RedisError
+from sqlalchemy.pool import NullPool, StaticPool, QueuePool
 
 from app.core.config import settings
+from app.core.instrumentation import InstrumentedRedis, instrument_engine
+from app.db.pool import InstrumentedAsyncQueuePool
 
-# Convert SQLite URL to async format for testing
-def get_async_db_url() -> str:
-    if settings.SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
-        return settings.SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://")
-    return settings.SQLALCHEMY_DATABASE_URL
+logger = logging.getLogger(__name__)
+
+# Async driver for each URL scheme; sync URLs (as used by Alembic) are rewritten
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def get_async_db_url(url: Optional[str] = None) -> str:
+    """Database URL with an async driver, preferring DATABASE_URL when set"""
+    url = url or settings.DATABASE_URL or settings.SQLALCHEMY_DATABASE_URL
+    scheme, separator, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+def get_connect_args(url: str) -> dict:
+    """Driver connection arguments for the async engine"""
+    if url.startswith("postgresql+asyncpg"):
+        connect_args = {
+            # SQLAlchemy's cache of asyncpg prepared statements, and asyncpg's own
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+        if settings.DB_STATEMENT_CACHE_SIZE == 0:
+            # Behind PgBouncer in transaction mode, sequentially named statements
+            # from different clients collide on a shared server connection
+            connect_args["prepared_statement_name_func"] = _unique_statement_name
+        return connect_args
+    return {}
+
+def _json_dumps(value) -> str:
+    return orjson.dumps(value).decode()
+
+def get_engine_options(url: str) -> dict:
+    """Build pool options for the async engine from settings"""
+    if settings.DB_POOL_MODE == "null":
+        return {"poolclass": NullPool}
+    if ":memory:" in url:
+        # Every connection to an in-memory SQLite database is a separate database
+        return {"poolclass": StaticPool}
+    if settings.DB_POOL_MODE != "queue":
+        raise ValueError(f"Unknown DB_POOL_MODE: {settings.DB_POOL_MODE}")
+    return {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_POOL_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+
+def create_engine_from_settings(url: str) -> AsyncEngine:
+    """Create an async engine using the configured pool mode"""
+    return create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        connect_args=get_connect_args(url),
+        # Used for JSON columns, and to register asyncpg's json/jsonb codecs
+        json_serializer=_json_dumps,
+        json_deserializer=orjson.loads,
+        **get_engine_options(url)
+    )
 
 # Create async engine
-engine = create_async_engine(
-    get_async_db_url(),
-    poolclass=NullPool,
-    echo=settings.DEBUG,
-)
+engine = create_engine_from_settings(get_async_db_url())
+instrument_engine(engine.sync_engine)
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -27,13 +93,59 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
-# Create Redis client
-redis_client = Redis(
+# Optional read replica; without one, reads use the primary
+replica_engine: Optional[AsyncEngine] = None
+ReplicaSessionLocal = AsyncSessionLocal
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine_from_settings(get_async_db_url(settings.DATABASE_REPLICA_URL))
+    instrument_engine(replica_engine.sync_engine)
+    ReplicaSessionLocal = async_sessionmaker(
+        replica_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+# Create Redis connection pool and client
+redis_pool = ConnectionPool(
     host=settings.REDIS_HOST,
     port=settings.REDIS_PORT,
-    password=settings.REDIS_PASSWORD,
+    password=settings.REDIS_PASSWORD or None,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+    socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS,
+    health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
     decode_responses=True
 )
+redis_client = InstrumentedRedis(connection_pool=redis_pool)
+
+async def open_connections() -> None:
+    """Start this process's DB and Redis pools with one live connection each.
+
+    Connections inherited from a parent that imported the app before forking
+    are dropped without being closed, since the parent still owns them. An
+    unreachable backend is logged rather than fatal; requests will retry.
+    """
+    for target in filter(None, (engine, replica_engine)):
+        await target.dispose(close=False)
+        try:
+            async with target.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except (SQLAlchemyError, OSError):
+            logger.warning("Could not connect to %s at startup", target.url, exc_info=True)
+    try:
+        await redis_client.ping()
+    except (RedisError, OSError):
+        logger.warning("Could not connect to Redis at startup", exc_info=True)
+
+async def close_connections() -> None:
+    """Close this process's DB and Redis pools"""
+    await redis_client.aclose()
+    await redis_pool.disconnect()
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Get async database session"""
@@ -43,6 +155,26 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+def get_sessionmaker() -> async_sessionmaker:
+    """Get the session factory, for work that outlives the request's session"""
+    return AsyncSessionLocal
+
 def get_redis() -> Redis:
     """Get Redis client"""
-    return redis_client 
\ No newline at end of file
+    return redis_client
+
+def get_pool_stats(target: AsyncEngine = engine) -> dict:
+    """Report connection pool usage for sizing pools per worker"""
+    pool = target.pool
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        stats["timeouts"] = pool.timeouts.value
+        stats["wait_seconds"] = pool.wait_time.snapshot()
+    return stats
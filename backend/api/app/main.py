@@ -1,22 +1,57 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
-from app.routers import users, auth
+from app.routers import users, auth, admin, guardians, health
+from app.db.session import open_connections, close_connections, redis_client
+from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.instrumentation import MetricsMiddleware
+from app.core.responses import default_response_class
+from app.core.user_cache import listen_for_invalidations
+from app.core.guardian_cache import listen_for_guardian_invalidations
+from app.core.revocation import listen_for_revocations, rebuild_revocation_filter
 
-app = FastAPI(
-    title="ScribeX API",
-    description="ScribeX writing education platform API",
-    version="0.1.0"
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs once per worker process, after any fork
+    await open_connections()
+    # An empty filter would let every revoked token through, so a worker
+    # that cannot load it does not start
+    await rebuild_revocation_filter(redis_client)
+    # Keep this worker's caches and revocation filter in step with other workers
+    listeners = [
+        asyncio.create_task(listen_for_invalidations(redis_client)),
+        asyncio.create_task(listen_for_revocations(redis_client)),
+        asyncio.create_task(listen_for_guardian_invalidations(redis_client)),
+    ]
+    yield
+    for listener in listeners:
+        listener.cancel()
+    for listener in listeners:
+        with suppress(asyncio.CancelledError):
+            await listener
+    await close_connections()
+    password_hasher.shutdown()
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "version": "0.1.0",
-        "database": "connected",
-        "environment": "development"
-    }
+def create_app() -> FastAPI:
+    """Build the ScribeX API application"""
+    app = FastAPI(
+        title="ScribeX API",
+        description="ScribeX writing education platform API",
+        version="0.1.0",
+        lifespan=lifespan,
+        default_response_class=default_response_class()
+    )
 
-# Include routers with prefixes
-app.include_router(users.router, prefix="/users", tags=["users"])
-app.include_router(auth.router, prefix="/auth", tags=["auth"])
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
+    # Include routers with prefixes
+    app.include_router(health.router, tags=["health"])
+    app.include_router(users.router, prefix="/users", tags=["users"])
+    app.include_router(auth.router, prefix="/auth", tags=["auth"])
+    app.include_router(admin.router, prefix="/admin", tags=["admin"])
+    app.include_router(guardians.router, prefix="/guardians", tags=["guardians"])
+    return app
+
+app = create_app()
@@ -1,13 +1,14 @@
 from enum import Enum
 from datetime import datetime
-from uuid import UUID, uuid4
+from uuid import UUID
 from typing import Optional, List
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum as SQLEnum, Boolean, JSON, DateTime
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum as SQLEnum, Boolean, JSON, DateTime, Index
+from sqlalchemy.orm import Mapped, deferred, relationship
 
 from .base import Base
+from .ids import new_id
 from .relationships import parent_student_association
+from .types import UUIDType
 
 class UserType(str, Enum):
     STUDENT = "student"
@@ -18,8 +19,8 @@ class UserType(str, Enum):
 class BaseProfile(Base):
     __tablename__ = "profiles"
     
-    id: Mapped[UUID] = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    user_id: Mapped[UUID] = Column(UUID(as_uuid=True), ForeignKey("users.id"), unique=True)
+    id: Mapped[UUID] = Column(UUIDType, primary_key=True, default=new_id)
+    user_id: Mapped[UUID] = Column(UUIDType, ForeignKey("users.id"), unique=True)
     user_type: Mapped[UserType] = Column(SQLEnum(UserType))
     first_name: Mapped[str] = Column(String)
     last_name: Mapped[str] = Column(String)
@@ -32,17 +33,21 @@ class BaseProfile(Base):
         "polymorphic_identity": "base",
         "polymorphic_on": "type"
     }
+    __table_args__ = (
+        Index("ix_profiles_type_user_id", "type", "user_id"),
+    )
 
 class StudentProfile(BaseProfile):
     __tablename__ = "student_profiles"
     
-    id: Mapped[UUID] = Column(UUID(as_uuid=True), ForeignKey("profiles.id"), primary_key=True)
-    grade_level: Mapped[int] = Column(Integer)
+    id: Mapped[UUID] = Column(UUIDType, ForeignKey("profiles.id"), primary_key=True)
+    grade_level: Mapped[int] = Column(Integer, index=True)
     has_iep: Mapped[bool] = Column(Boolean, default=False)
     # IEP Details
-    iep_summary: Mapped[Optional[str]] = Column(String, nullable=True)
-    accommodations: Mapped[Optional[dict]] = Column(JSON, nullable=True)
-    iep_goals: Mapped[Optional[dict]] = Column(JSON, nullable=True)
+    # Potentially large, so only loaded on access or with undefer_group("iep")
+    iep_summary: Mapped[Optional[str]] = deferred(Column(String, nullable=True), group="iep")
+    accommodations: Mapped[Optional[dict]] = deferred(Column(JSON, nullable=True), group="iep")
+    iep_goals: Mapped[Optional[dict]] = deferred(Column(JSON, nullable=True), group="iep")
     last_iep_review: Mapped[Optional[datetime]] = Column(DateTime, nullable=True)
     
     # Relationships
@@ -59,7 +64,7 @@ class StudentProfile(BaseProfile):
 class TeacherProfile(BaseProfile):
     __tablename__ = "teacher_profiles"
     
-    id: Mapped[UUID] = Column(UUID(as_uuid=True), ForeignKey("profiles.id"), primary_key=True)
+    id: Mapped[UUID] = Column(UUIDType, ForeignKey("profiles.id"), primary_key=True)
     subject: Mapped[str] = Column(String)
     room_number: Mapped[str] = Column(String)
     
@@ -70,7 +75,7 @@ class TeacherProfile(BaseProfile):
 class ParentProfile(BaseProfile):
     __tablename__ = "parent_profiles"
     
-    id: Mapped[UUID] = Column(UUID(as_uuid=True), ForeignKey("profiles.id"), primary_key=True)
+    id: Mapped[UUID] = Column(UUIDType, ForeignKey("profiles.id"), primary_key=True)
     
     # Relationships
     students: Mapped[List["StudentProfile"]] = relationship(
@@ -86,7 +91,7 @@ class ParentProfile(BaseProfile):
 class AdminProfile(BaseProfile):
     __tablename__ = "admin_profiles"
     
-    id: Mapped[UUID] = Column(UUID(as_uuid=True), ForeignKey("profiles.id"), primary_key=True)
+    id: Mapped[UUID] = Column(UUIDType, ForeignKey("profiles.id"), primary_key=True)
     department: Mapped[Optional[str]] = Column(String, nullable=True)
     
     __mapper_args__ = {
@@ -1,10 +1,12 @@
 from sqlalchemy import Table, Column, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
 from .base import Base
+from .types import UUIDType
 
+# Keyed on (parent_id, student_id), which also serves parent -> students
+# lookups; the student_id index serves student -> parents
 parent_student_association = Table(
     'parent_student_association',
     Base.metadata,
-    Column('parent_id', UUID(as_uuid=True), ForeignKey('parent_profiles.id')),
-    Column('student_id', UUID(as_uuid=True), ForeignKey('student_profiles.id'))
-) 
\ No newline at end of file
+    Column('parent_id', UUIDType, ForeignKey('parent_profiles.id', ondelete='CASCADE'), primary_key=True),
+    Column('student_id', UUIDType, ForeignKey('student_profiles.id', ondelete='CASCADE'), primary_key=True, index=True)
+)
@@ -0,0 +1,45 @@
+from uuid import UUID, SafeUUID
+
+from sqlalchemy import LargeBinary, TypeDecorator
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+
+def uuid_from_bytes(value):
+    """Build a UUID from 16 stored bytes, skipping UUID.__init__'s argument
+    parsing and validation (the bytes came from uuid.bytes on the way in)"""
+    if value is None:
+        return None
+    uuid = object.__new__(UUID)
+    object.__setattr__(uuid, "int", int.from_bytes(value, "big"))
+    object.__setattr__(uuid, "is_safe", SafeUUID.unknown)
+    return uuid
+
+class UUIDType(TypeDecorator):
+    """Platform-independent UUID type.
+    Native uuid on PostgreSQL, a 16-byte BLOB everywhere else (SQLite)."""
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(PostgresUUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        if not isinstance(value, UUID):
+            value = UUID(str(value))
+        if dialect.name == "postgresql":
+            return value
+        return value.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, UUID):
+            return value
+        return UUID(bytes=value)
+
+    def result_processor(self, dialect, coltype):
+        if dialect.name == "postgresql":
+            return super().result_processor(dialect, coltype)
+        # One call per value instead of the impl processor plus process_result_value
+        return uuid_from_bytes
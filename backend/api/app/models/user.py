@@ -1,36 +1,37 @@
-from sqlalchemy import Column, String, Boolean, DateTime, TypeDecorator
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, Boolean, DateTime, Index, Integer
 from sqlalchemy.sql import func
-from uuid import UUID
-from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import relationship
 
 from .base import Base
-
-class UUIDType(TypeDecorator):
-    """Platform-independent UUID type.
-    Uses String as the base type for SQLite compatibility."""
-    impl = String
-    cache_ok = True
-
-    def process_bind_param(self, value, dialect):
-        if value is None:
-            return value
-        return str(value)
-
-    def process_result_value(self, value, dialect):
-        if value is None:
-            return value
-        return UUID(value)
+from .ids import new_id
+from .types import UUIDType
 
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(UUIDType, primary_key=True)
+    id = Column(UUIDType, primary_key=True, default=new_id)
     username = Column(String, unique=True, index=True)
     email = Column(String, unique=True, index=True)
     hashed_password = Column(String)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Embedded in every token; bumping it revokes all of the user's sessions
+    session_generation = Column(Integer, nullable=False, default=0, server_default="0")
+    # Row version: bumped on every ORM update and used for response ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Set client-side too, so keyset cursors compare with the stored precision
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now()
+    )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    profile = relationship("BaseProfile", back_populates="user", uselist=False) 
\ No newline at end of file
+    profile = relationship("BaseProfile", back_populates="user", uselist=False)
+
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        # Keyset pagination order for user listings
+        Index("ix_users_created_at_id", "created_at", "id"),
+    ) 
\ No newline at end of file
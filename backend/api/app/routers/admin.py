@@ -0,0 +1,116 @@
+import json
+import logging
+from typing import Literal, Optional
+from uuid import uuid4
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.security import AuthenticatedUser, require_role
+from app.db.session import get_db, get_redis, get_sessionmaker
+from app.db.routing import mark_recent_write
+from app.services.user_import import IMPORT_FORMATS, ImportReport, UserImporter, parse_rows
+from app.services.user_export import EXPORT_MEDIA_TYPES, export_users, gzip_chunks
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+IMPORT_PROGRESS_TTL_SECONDS = 86400
+
+@router.post("/users/bulk-import")
+async def bulk_import_users(
+    request: Request,
+    import_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    current_user: AuthenticatedUser = Depends(require_role("admin"))
+) -> dict:
+    """Stream a CSV or NDJSON file of students and teachers into the database (admin only)
+
+    Rows are parsed as they arrive and written in batches. Pass an import_id
+    to poll progress from GET /admin/users/bulk-import/{import_id} while the
+    upload is running.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    fmt = IMPORT_FORMATS.get(content_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Expected one of: {', '.join(IMPORT_FORMATS)}"
+        )
+
+    import_id = import_id or uuid4().hex
+
+    async def record_progress(report: ImportReport, import_status: str = "running") -> None:
+        logger.info("Bulk import %s %s: %s", import_id, import_status, report.summary())
+        try:
+            await redis.set(
+                f"bulk-import:{import_id}",
+                json.dumps({"status": import_status, **report.summary()}),
+                ex=IMPORT_PROGRESS_TTL_SECONDS
+            )
+        except RedisError:
+            logger.warning("Could not record progress for bulk import %s", import_id)
+
+    importer = UserImporter(
+        db,
+        batch_size=settings.BULK_IMPORT_BATCH_SIZE,
+        max_errors=settings.BULK_IMPORT_MAX_REPORTED_ERRORS,
+        on_progress=record_progress
+    )
+    try:
+        report = await importer.run(parse_rows(request.stream(), fmt))
+    except Exception:
+        # Batches written so far stay committed; report how far the import got
+        logger.exception("Bulk import %s failed", import_id)
+        await record_progress(importer.report, "failed")
+        await mark_recent_write(redis, current_user.id)
+        raise
+    await mark_recent_write(redis, current_user.id)
+
+    result = {"import_id": import_id, "status": "completed", **report.summary()}
+    try:
+        await redis.set(f"bulk-import:{import_id}", json.dumps(result), ex=IMPORT_PROGRESS_TTL_SECONDS)
+    except RedisError:
+        logger.warning("Could not record result for bulk import %s", import_id)
+    return {**result, "errors": report.errors}
+
+@router.get("/users/bulk-import/{import_id}")
+async def bulk_import_progress(
+    import_id: str,
+    redis: Redis = Depends(get_redis),
+    current_user: AuthenticatedUser = Depends(require_role("admin"))
+) -> dict:
+    """Progress of a running or recently finished bulk import (admin only)"""
+    progress = await redis.get(f"bulk-import:{import_id}")
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import not found"
+        )
+    return {"import_id": import_id, **json.loads(progress)}
+
+@router.get("/users/bulk-export")
+async def bulk_export_users(
+    format: Literal["csv", "ndjson"] = "csv",
+    compress: bool = False,
+    session_factory: async_sessionmaker = Depends(get_sessionmaker),
+    current_user: AuthenticatedUser = Depends(require_role("admin"))
+) -> StreamingResponse:
+    """Stream every user with flattened profile columns as CSV or NDJSON (admin only)"""
+    chunks = export_users(session_factory, format, settings.BULK_EXPORT_CHUNK_SIZE)
+    filename = f"users.{format}"
+    media_type = EXPORT_MEDIA_TYPES[format]
+    if compress:
+        chunks = gzip_chunks(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -3,15 +3,17 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Optional
-from redis import Redis
+from uuid import UUID
+from redis.asyncio import Redis
 
 from app.core.security import (
     create_access_token,
     create_refresh_token,
-    verify_password,
-    decode_refresh_token,
-    decode_access_token
+    verify_password_async,
+    decode_token
 )
+from app.core.responses import model_response
+from app.core.revocation import revoke_token, is_token_revoked
 from app.db.session import get_db, get_redis
 from app.models.user import User
 from app.schemas.auth import TokenResponse
@@ -31,7 +33,7 @@ async def login(
     )
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -39,28 +41,27 @@ async def login(
         )
 
     # Create tokens
-    access_token = create_access_token(user.id)
-    refresh_token = create_refresh_token(user.id)
+    access_token = create_access_token(user.id, generation=user.session_generation)
+    refresh_token = create_refresh_token(user.id, generation=user.session_generation)
 
-    return {
-        "access_token": access_token,
-        "refresh_token": refresh_token,
-        "token_type": "bearer",
-        "expires_in": 1800  # 30 minutes
-    }
+    return model_response(TokenResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer",
+        expires_in=1800  # 30 minutes
+    ))
 
 @router.post("/logout")
 async def logout(
     token: str = Depends(oauth2_scheme),
     redis: Redis = Depends(get_redis)
 ):
-    """Logout endpoint that blacklists the current token"""
+    """Logout endpoint that revokes the current token"""
     try:
-        # Get user_id from token
-        user_id = decode_access_token(token)
-        
-        # Add token to blacklist with expiry
-        await redis.setex(f"blacklist:{token}", 1800, "true")
+        claims = decode_token(token, "access")
+
+        # Revoke by jti for the rest of the token's lifetime
+        await revoke_token(redis, claims["jti"], claims["exp"])
         
         return {"msg": "Successfully logged out"}
     except ValueError:
@@ -77,34 +78,39 @@ async def refresh_token(
 ):
     """Issues a new access token using a valid refresh token"""
     try:
-        # Check if token is blacklisted
-        if await redis.get(f"blacklist:{token}"):
+        claims = decode_token(token, "refresh")
+        if await is_token_revoked(redis, claims["jti"]):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has been invalidated",
             )
 
-        user_id = decode_refresh_token(token)
+        user_id = UUID(claims["sub"])
         result = await db.execute(
             select(User).filter(User.id == user_id)
         )
         user = result.scalar_one_or_none()
         
-        if not user:
+        # Sessions revoked in bulk have an older generation than the user
+        if (
+            not user
+            or not user.is_active
+            or claims.get("gen", 0) != user.session_generation
+        ):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid refresh token",
             )
         
-        access_token = create_access_token(user.id)
-        refresh_token = create_refresh_token(user.id)
+        access_token = create_access_token(user.id, generation=user.session_generation)
+        refresh_token = create_refresh_token(user.id, generation=user.session_generation)
         
-        return {
-            "access_token": access_token,
-            "refresh_token": refresh_token,
-            "token_type": "bearer",
-            "expires_in": 1800
-        }
+        return model_response(TokenResponse(
+            access_token=access_token,
+            refresh_token=refresh_token,
+            token_type="bearer",
+            expires_in=1800
+        ))
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,138 @@
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, status
+from redis.asyncio import Redis
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.guardian_cache import get_guardian_student_ids, invalidate_guardian
+from app.core.responses import model_response
+from app.core.security import AuthenticatedUser, get_current_user, require_role
+from app.db.session import get_db, get_redis
+from app.db.routing import get_read_db, mark_recent_write
+from app.models.profiles import BaseProfile, StudentProfile
+from app.models.relationships import parent_student_association
+from app.schemas.user import StudentProgressResponse
+
+router = APIRouter()
+
+async def authorize_guardian(
+    guardian_id: UUID,
+    student_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> AuthenticatedUser:
+    """Allow a guardian (or an admin) through for one of the guardian's students.
+
+    Checks membership in the guardian's cached student id set, so once the
+    set is warm the check makes no query.
+    """
+    if current_user.role != "admin" and current_user.id != guardian_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to act for this guardian"
+        )
+    if student_id not in await get_guardian_student_ids(db, redis, guardian_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this student"
+        )
+    return current_user
+
+@router.get("/{guardian_id}/students/{student_id}/progress", response_model=StudentProgressResponse)
+async def read_student_progress(
+    student_id: UUID,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: AuthenticatedUser = Depends(authorize_guardian)
+) -> StudentProgressResponse:
+    """Get a linked student's progress (the guardian or an admin)"""
+    profiles = BaseProfile.__table__
+    students = StudentProfile.__table__
+    result = await db.execute(
+        select(
+            profiles.c.user_id.label("student_id"),
+            profiles.c.first_name,
+            profiles.c.last_name,
+            students.c.grade_level,
+            students.c.has_iep,
+            students.c.last_iep_review
+        )
+        .select_from(profiles.join(students, students.c.id == profiles.c.id))
+        .filter(profiles.c.user_id == student_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Student not found"
+        )
+    return model_response(StudentProgressResponse.model_construct(**row._mapping))
+
+def _profile_id(user_id: UUID, profile_type: str):
+    profiles = BaseProfile.__table__
+    return (
+        select(profiles.c.id)
+        .filter(profiles.c.user_id == user_id, profiles.c.type == profile_type)
+        .scalar_subquery()
+    )
+
+@router.put("/{guardian_id}/students/{student_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def link_student(
+    guardian_id: UUID,
+    student_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    current_user: AuthenticatedUser = Depends(require_role("admin"))
+):
+    """Link a student to a guardian; linking twice is a no-op (admin only)"""
+    result = await db.execute(
+        select(_profile_id(guardian_id, "parent"), _profile_id(student_id, "student"))
+    )
+    parent_profile_id, student_profile_id = result.one()
+    if parent_profile_id is None or student_profile_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Guardian or student not found"
+        )
+
+    try:
+        async with db.begin_nested():
+            await db.execute(
+                insert(parent_student_association)
+                .values(parent_id=parent_profile_id, student_id=student_profile_id)
+            )
+    except IntegrityError:
+        # Already linked
+        return None
+    await db.commit()
+    await invalidate_guardian(redis, guardian_id)
+    await mark_recent_write(redis, current_user.id)
+    return None
+
+@router.delete("/{guardian_id}/students/{student_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def unlink_student(
+    guardian_id: UUID,
+    student_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    current_user: AuthenticatedUser = Depends(require_role("admin"))
+):
+    """Remove a student from a guardian (admin only)"""
+    links = parent_student_association
+    result = await db.execute(
+        delete(links).where(
+            links.c.parent_id == _profile_id(guardian_id, "parent"),
+            links.c.student_id == _profile_id(student_id, "student")
+        )
+    )
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Link not found"
+        )
+
+    await db.commit()
+    await invalidate_guardian(redis, guardian_id)
+    await mark_recent_write(redis, current_user.id)
+    return None
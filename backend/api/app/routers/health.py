@@ -0,0 +1,58 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.hashing import password_hasher
+from app.core.instrumentation import FAMILIES
+from app.core.metrics import render_stats
+from app.core.revocation import get_revocation_stats
+from app.core.user_cache import user_cache
+from app.core.guardian_cache import guardian_students_cache
+from app.db.session import get_pool_stats, replica_engine
+
+router = APIRouter()
+
+@router.get("/health")
+async def health_check():
+    """Health check endpoint"""
+    return {
+        "status": "healthy",
+        "version": "0.1.0",
+        "database": "connected",
+        "environment": "development"
+    }
+
+@router.get("/health/pool")
+async def pool_stats():
+    """Database connection pool statistics"""
+    stats = get_pool_stats()
+    if replica_engine is not None:
+        stats["replica"] = get_pool_stats(replica_engine)
+    return stats
+
+@router.get("/health/hashing")
+async def hashing_stats():
+    """Password hashing executor statistics"""
+    return password_hasher.get_stats()
+
+@router.get("/health/cache")
+async def cache_stats():
+    """Authenticated user cache statistics"""
+    return user_cache.get_stats()
+
+@router.get("/health/revocations")
+async def revocation_stats():
+    """Token revocation filter statistics"""
+    return get_revocation_stats()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics for this worker, including the /health/* statistics"""
+    lines = []
+    for family in FAMILIES:
+        lines += family.render()
+    lines += render_stats("db_pool", get_pool_stats())
+    lines += render_stats("password_hasher", password_hasher.get_stats())
+    lines += render_stats("user_cache", user_cache.get_stats())
+    lines += render_stats("guardian_cache", guardian_students_cache.get_stats())
+    lines += render_stats("token_revocation", get_revocation_stats())
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
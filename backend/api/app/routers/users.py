@@ -1,197 +1,314 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import Optional
-from uuid import UUID, uuid4
-from redis import Redis
-from sqlalchemy import select
+import asyncio
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from typing import Literal, Optional
+from uuid import UUID
+from redis.asyncio import Redis
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_current_user, get_password_hash
+from app.core.etag import CACHE_CONTROL, etag_matches, not_modified, user_etag
+from app.core.guardian_cache import invalidate_guardian
+from app.core.hashing import password_hasher
+from app.core.responses import model_response
+from app.core.security import AuthenticatedUser, get_current_user, get_password_hash_async, require_role
+from app.core.user_cache import invalidate_user, user_cache
 from app.db.session import get_db, get_redis
+from app.db.routing import get_read_db, mark_recent_write
+from app.db.read_models import (
+    ALL_DETAIL_FIELDS,
+    DEFAULT_DETAIL_FIELDS,
+    DEFAULT_LISTING_FIELDS,
+    LISTING_COLUMNS,
+    LISTING_FIELDS,
+    parse_fields,
+    select_listing,
+    select_user_with_profile,
+    user_list_items,
+    user_with_profile
+)
+from app.db.pagination import decode_cursor, encode_cursor
+from app.models.ids import new_id
 from app.models.user import User
-from app.models.profiles import AdminProfile, StudentProfile, TeacherProfile
+from app.models.profiles import BaseProfile, StudentProfile, TeacherProfile
 from app.schemas.user import (
     UserUpdate,
-    UserInDB,
     UserResponse,
+    UserWithProfileResponse,
+    UserPage,
+    BatchCreateResult,
+    StudentBatchCreate,
     StudentCreate,
     TeacherCreate
 )
 
 router = APIRouter()
 
-@router.get("/me", response_model=UserResponse)
-async def read_users_me(
-    current_user: User = Depends(get_current_user)
-) -> UserResponse:
-    """Get current user information"""
-    return UserResponse.model_validate(current_user)
+FIELDS_DESCRIPTION = (
+    "Comma-separated fields to return; profile fields are prefixed with "
+    "\"profile.\" on single-user reads. Large IEP fields are only returned "
+    "when named."
+)
 
-@router.get("/{user_id}", response_model=UserResponse)
-async def read_user(
-    user_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-) -> UserResponse:
-    """Get user by ID (admin only)"""
-    # Check if current user is admin
-    result = await db.execute(
-        select(AdminProfile).filter(AdminProfile.user_id == current_user.id)
-    )
-    admin_profile = result.scalar_one_or_none()
-    if not admin_profile:
+def _fields(value: Optional[str], allowed, default, known=()) -> tuple:
+    try:
+        return parse_fields(value, allowed, default, known)
+    except PermissionError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
+            detail=str(e)
         )
-    
-    result = await db.execute(
-        select(User).filter(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
-    if not user:
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
-    return UserResponse.model_validate(user)
 
-@router.post("/student", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def create_student(
-    user_in: StudentCreate,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-) -> UserResponse:
-    """Create a new student user (admin only)"""
-    # Check if current user is admin
+@router.get("", response_model=UserPage)
+async def list_users(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    type: Optional[Literal["student", "teacher", "parent", "admin"]] = None,
+    grade_level: Optional[int] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: AuthenticatedUser = Depends(require_role("admin", "teacher"))
+) -> UserPage:
+    """Page through users oldest first (admins see everyone, teachers see students)
+
+    Pages are keyed on (created_at, id) rather than OFFSET, so any page costs
+    the same as the first. Pass next_cursor from one page to get the next.
+    """
+    if current_user.role == "teacher":
+        if type not in (None, "student"):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Teachers can only list students"
+            )
+        type = "student"
+    fields = _fields(
+        fields,
+        LISTING_FIELDS[current_user.role],
+        DEFAULT_LISTING_FIELDS[current_user.role],
+        known=LISTING_COLUMNS
+    )
+
+    users = User.__table__
+    stmt = select_listing(fields).order_by(users.c.created_at, users.c.id).limit(limit + 1)
+    if type is not None:
+        stmt = stmt.filter(BaseProfile.__table__.c.type == type)
+    if grade_level is not None:
+        stmt = stmt.filter(StudentProfile.__table__.c.grade_level == grade_level)
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        stmt = stmt.filter(tuple_(users.c.created_at, users.c.id) > after)
+
+    rows = (await db.execute(stmt)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return model_response(UserPage(
+        items=user_list_items(rows, fields),
+        next_cursor=next_cursor
+    ), exclude_unset=True)
+
+@router.get("/me", response_model=UserWithProfileResponse)
+async def read_users_me(
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> UserWithProfileResponse:
+    """Get current user information with profile"""
+    fields = _fields(fields, ALL_DETAIL_FIELDS, DEFAULT_DETAIL_FIELDS)
+    # The resolved user already carries the row version, so a match costs no query
+    etag = user_etag(current_user.id, current_user.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
     result = await db.execute(
-        select(AdminProfile).filter(AdminProfile.user_id == current_user.id)
+        select_user_with_profile(fields).filter(User.id == current_user.id)
     )
-    admin_profile = result.scalar_one_or_none()
-    if not admin_profile:
+    row = result.one_or_none()
+    if row is None:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
         )
-    
-    # Check if username or email already exists
+    response.headers["ETag"] = user_etag(row.id, row.version)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return model_response(user_with_profile(row, fields), response=response, exclude_unset=True)
+
+@router.get("/{user_id}", response_model=UserWithProfileResponse)
+async def read_user(
+    user_id: UUID,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: AuthenticatedUser = Depends(require_role("admin"))
+) -> UserWithProfileResponse:
+    """Get user by ID with profile (admin only)"""
+    fields = _fields(fields, ALL_DETAIL_FIELDS, DEFAULT_DETAIL_FIELDS)
+    if if_none_match:
+        # Check the version stamp before loading the user and profile
+        cached = user_cache.get(user_id)
+        if cached is not None:
+            version = cached.version
+        else:
+            result = await db.execute(select(User.version).filter(User.id == user_id))
+            version = result.scalar_one_or_none()
+        if version is not None and etag_matches(if_none_match, user_etag(user_id, version)):
+            return not_modified(user_etag(user_id, version))
+
     result = await db.execute(
-        select(User).filter(User.username == user_in.username)
+        select_user_with_profile(fields).filter(User.id == user_id)
     )
-    if result.scalar_one_or_none():
+    row = result.one_or_none()
+    if row is None:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already registered"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
         )
-    
+    response.headers["ETag"] = user_etag(row.id, row.version)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return model_response(user_with_profile(row, fields), response=response, exclude_unset=True)
+
+async def _conflict_detail(db: AsyncSession, user_in) -> str:
+    """Work out which unique constraint a failed insert ran into"""
     result = await db.execute(
-        select(User).filter(User.email == user_in.email)
+        select(User.id).filter(User.username == user_in.username)
     )
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
+    if result.first() is not None:
+        return "Username already registered"
+    return "Email already registered"
+
+def _new_account(user_in, hashed_password: str, profile: BaseProfile) -> User:
     user = User(
-        id=uuid4(),
+        id=new_id(),
         username=user_in.username,
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         is_active=True
     )
+    profile.user = user
+    return user
+
+async def _create_account(db: AsyncSession, user: User) -> User:
+    """Insert a user and profile in one transaction, relying on the unique
+    constraints on username and email to detect conflicts"""
     db.add(user)
-    await db.commit()
-    await db.refresh(user)
-    
-    # Create student profile
-    student_profile = StudentProfile(
-        user_id=user.id,
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=await _conflict_detail(db, user)
+        )
+    return user
+
+def _student_profile(user_in: StudentCreate) -> StudentProfile:
+    return StudentProfile(
         first_name=user_in.profile.first_name,
         last_name=user_in.profile.last_name,
         grade_level=user_in.profile.grade_level
     )
-    db.add(student_profile)
+
+@router.post("/student", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def create_student(
+    user_in: StudentCreate,
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    current_user: AuthenticatedUser = Depends(require_role("admin"))
+) -> UserResponse:
+    """Create a new student user (admin only)"""
+    user = _new_account(
+        user_in,
+        await get_password_hash_async(user_in.password),
+        _student_profile(user_in)
+    )
+    await _create_account(db, user)
+    await mark_recent_write(redis, current_user.id)
+    return model_response(UserResponse.model_validate(user), status_code=status.HTTP_201_CREATED)
+
+@router.post("/students:batch", response_model=list[BatchCreateResult])
+async def create_students_batch(
+    users_in: StudentBatchCreate,
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    current_user: AuthenticatedUser = Depends(require_role("admin"))
+) -> list[BatchCreateResult]:
+    """Create many student users in one transaction, with a result per item (admin only)
+
+    Each account is inserted under its own savepoint, so a conflicting item
+    is reported without failing the others.
+    """
+    # Leave the rest of the hashing queue free for interactive logins
+    hash_slots = asyncio.Semaphore(password_hasher.max_workers)
+
+    async def hash_password(password: str) -> str:
+        async with hash_slots:
+            return await get_password_hash_async(password)
+
+    hashes = await asyncio.gather(*(hash_password(user_in.password) for user_in in users_in))
+
+    results = []
+    for index, (user_in, hashed_password) in enumerate(zip(users_in, hashes)):
+        user = _new_account(user_in, hashed_password, _student_profile(user_in))
+        try:
+            async with db.begin_nested():
+                db.add(user)
+        except IntegrityError:
+            results.append(BatchCreateResult(index=index, error=await _conflict_detail(db, user_in)))
+            continue
+        results.append(BatchCreateResult(index=index, user=UserResponse.model_validate(user)))
     await db.commit()
-    
-    return UserResponse.model_validate(user)
+    await mark_recent_write(redis, current_user.id)
+    return model_response(results)
 
 @router.post("/teacher", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_teacher(
     user_in: TeacherCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    redis: Redis = Depends(get_redis),
+    current_user: AuthenticatedUser = Depends(require_role("admin"))
 ) -> UserResponse:
     """Create a new teacher user (admin only)"""
-    # Check if current user is admin
-    result = await db.execute(
-        select(AdminProfile).filter(AdminProfile.user_id == current_user.id)
-    )
-    admin_profile = result.scalar_one_or_none()
-    if not admin_profile:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
+    user = _new_account(
+        user_in,
+        await get_password_hash_async(user_in.password),
+        TeacherProfile(
+            first_name=user_in.profile.first_name,
+            last_name=user_in.profile.last_name,
+            subject=user_in.profile.subject,
+            room_number=user_in.profile.room_number
         )
-    
-    # Check if username or email already exists
-    result = await db.execute(
-        select(User).filter(User.username == user_in.username)
     )
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already registered"
-        )
-    
-    result = await db.execute(
-        select(User).filter(User.email == user_in.email)
-    )
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
-    user = User(
-        id=uuid4(),
-        username=user_in.username,
-        email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
-        is_active=True
-    )
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
-    
-    # Create teacher profile
-    teacher_profile = TeacherProfile(
-        user_id=user.id,
-        first_name=user_in.profile.first_name,
-        last_name=user_in.profile.last_name,
-        subject=user_in.profile.subject,
-        room_number=user_in.profile.room_number
-    )
-    db.add(teacher_profile)
-    await db.commit()
-    
-    return UserResponse.model_validate(user)
+    await _create_account(db, user)
+    await mark_recent_write(redis, current_user.id)
+    return model_response(UserResponse.model_validate(user), status_code=status.HTTP_201_CREATED)
 
 @router.put("/{user_id}", response_model=UserResponse)
 async def update_user(
     user_id: UUID,
     user_update: UserUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    redis: Redis = Depends(get_redis),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ) -> UserResponse:
     """Update user information (admin only or self)"""
     # Check if current user is admin or self
-    result = await db.execute(
-        select(AdminProfile).filter(AdminProfile.user_id == current_user.id)
-    )
-    is_admin = result.scalar_one_or_none() is not None
-
-    if not is_admin and current_user.id != user_id:
+    if current_user.role != "admin" and current_user.id != user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to update this user"
@@ -215,32 +332,64 @@ async def update_user(
     if user_update.username is not None:
         user.username = user_update.username
     if user_update.password is not None:
-        user.hashed_password = get_password_hash(user_update.password)
+        user.hashed_password = await get_password_hash_async(user_update.password)
     if user_update.is_active is not None:
+        if user.is_active and not user_update.is_active:
+            # Deactivation also revokes every outstanding token
+            user.session_generation += 1
         user.is_active = user_update.is_active
 
-    await db.commit()
-    return UserResponse.model_validate(user)
+    try:
+        # Bumps the row version, which changes the user's ETag
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User was modified concurrently, retry the update"
+        )
+    await invalidate_user(redis, user_id)
+    await mark_recent_write(redis, current_user.id)
+    return model_response(UserResponse.model_validate(user))
 
-@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(
+@router.post("/{user_id}/sessions/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_sessions(
     user_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    redis: Redis = Depends(get_redis),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
-    """Delete user (admin only)"""
-    # Check if current user is admin
+    """Revoke all of a user's access and refresh tokens (admin only or self)"""
+    if current_user.role != "admin" and current_user.id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to revoke sessions for this user"
+        )
+
     result = await db.execute(
-        select(AdminProfile).filter(AdminProfile.user_id == current_user.id)
+        update(User)
+        .where(User.id == user_id)
+        .values(session_generation=User.session_generation + 1)
     )
-    admin_profile = result.scalar_one_or_none()
-
-    if not admin_profile:
+    if result.rowcount == 0:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to delete users"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
         )
 
+    await db.commit()
+    await invalidate_user(redis, user_id)
+    await mark_recent_write(redis, current_user.id)
+    return None
+
+@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_user(
+    user_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    current_user: AuthenticatedUser = Depends(require_role("admin"))
+):
+    """Delete user (admin only)"""
     # Get user to delete
     result = await db.execute(
         select(User).filter(User.id == user_id)
@@ -255,4 +404,8 @@ async def delete_user(
 
     await db.delete(user)
     await db.commit()
+    await invalidate_user(redis, user_id)
+    # In case they were a guardian; students' guardians simply 404 on them
+    await invalidate_guardian(redis, user_id)
+    await mark_recent_write(redis, current_user.id)
     return None 
\ No newline at end of file
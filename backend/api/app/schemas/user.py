@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
-from typing import Optional
-from pydantic import BaseModel, EmailStr, constr, ConfigDict
+from typing import Optional, Literal, Union, Annotated
+from pydantic import BaseModel, EmailStr, constr, ConfigDict, Field
 
 class UserBase(BaseModel):
     username: constr(min_length=3, max_length=50)
@@ -27,6 +27,10 @@ class StudentCreate(UserCreateBase):
 class TeacherCreate(UserCreateBase):
     profile: TeacherProfileCreate
 
+MAX_BATCH_CREATE = 500
+
+StudentBatchCreate = Annotated[list[StudentCreate], Field(min_length=1, max_length=MAX_BATCH_CREATE)]
+
 class UserUpdate(BaseModel):
     username: Optional[constr(min_length=3, max_length=50)] = None
     email: Optional[EmailStr] = None
@@ -48,4 +52,73 @@ class UserResponse(BaseModel):
     email: EmailStr
     is_active: bool
     
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class BatchCreateResult(BaseModel):
+    index: int
+    user: Optional[UserResponse] = None
+    error: Optional[str] = None
+
+class ProfileResponse(BaseModel):
+    id: UUID
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class StudentProfileResponse(ProfileResponse):
+    type: Literal["student"]
+    grade_level: Optional[int] = None
+    has_iep: Optional[bool] = None
+    iep_summary: Optional[str] = None
+    accommodations: Optional[dict] = None
+    iep_goals: Optional[dict] = None
+    last_iep_review: Optional[datetime] = None
+
+class TeacherProfileResponse(ProfileResponse):
+    type: Literal["teacher"]
+    subject: Optional[str] = None
+    room_number: Optional[str] = None
+
+class ParentProfileResponse(ProfileResponse):
+    type: Literal["parent"]
+
+class AdminProfileResponse(ProfileResponse):
+    type: Literal["admin"]
+    department: Optional[str] = None
+
+TypedProfileResponse = Annotated[
+    Union[StudentProfileResponse, TeacherProfileResponse, ParentProfileResponse, AdminProfileResponse],
+    Field(discriminator="type")
+]
+
+class UserWithProfileResponse(UserResponse):
+    profile: Optional[TypedProfileResponse] = None
+
+class UserListItem(BaseModel):
+    id: UUID
+    username: str
+    email: str
+    is_active: bool
+    created_at: Optional[datetime] = None
+    role: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    grade_level: Optional[int] = None
+    has_iep: Optional[bool] = None
+    iep_summary: Optional[str] = None
+    accommodations: Optional[dict] = None
+    iep_goals: Optional[dict] = None
+    last_iep_review: Optional[datetime] = None
+
+class StudentProgressResponse(BaseModel):
+    student_id: UUID
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    grade_level: Optional[int] = None
+    has_iep: Optional[bool] = None
+    last_iep_review: Optional[datetime] = None
+
+class UserPage(BaseModel):
+    items: list[UserListItem]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,75 @@
+"""Production entry point: python -m app.server
+
+Runs app.main:app under gunicorn with uvicorn workers (uvloop and httptools
+when installed). On SIGTERM gunicorn stops accepting connections and gives
+in-flight requests SERVER_GRACEFUL_TIMEOUT_SECONDS to finish. Falls back to
+uvicorn's own process manager where gunicorn isn't available (Windows), and
+to a single reloading uvicorn process when SERVER_RELOAD is set.
+"""
+import os
+
+from app.core.config import settings
+
+APP = "app.main:app"
+
+def worker_count() -> int:
+    return settings.SERVER_WORKERS or os.cpu_count() or 1
+
+def gunicorn_options() -> dict:
+    return {
+        "bind": f"{settings.SERVER_HOST}:{settings.SERVER_PORT}",
+        "workers": worker_count(),
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "keepalive": settings.SERVER_KEEPALIVE_SECONDS,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "timeout": settings.SERVER_TIMEOUT_SECONDS,
+        "preload_app": settings.SERVER_PRELOAD,
+        # Recycle workers now and then; jitter keeps them from restarting together
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS // 10,
+        "accesslog": "-",
+    }
+
+def run_gunicorn() -> None:
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):
+        def load_config(self):
+            for key, value in gunicorn_options().items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # With preload this runs once in the master, otherwise in each worker
+            from app.main import app
+            return app
+
+    Application().run()
+
+def run_uvicorn() -> None:
+    import uvicorn
+
+    uvicorn.run(
+        APP,
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=1 if settings.SERVER_RELOAD else worker_count(),
+        reload=settings.SERVER_RELOAD,
+        loop="auto",
+        http="auto",
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+    )
+
+def main() -> None:
+    if settings.SERVER_RELOAD:
+        run_uvicorn()
+        return
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        run_uvicorn()
+        return
+    run_gunicorn()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import AsyncIterator
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.user import User
+from app.models.profiles import BaseProfile, StudentProfile, TeacherProfile, AdminProfile
+
+users = User.__table__
+profiles = BaseProfile.__table__
+students = StudentProfile.__table__
+teachers = TeacherProfile.__table__
+admins = AdminProfile.__table__
+
+# One flat row per user; subtype columns are empty for other profile types
+EXPORT_COLUMNS = [
+    users.c.id,
+    users.c.username,
+    users.c.email,
+    users.c.is_active,
+    users.c.created_at,
+    profiles.c.type.label("role"),
+    profiles.c.first_name,
+    profiles.c.last_name,
+    students.c.grade_level,
+    students.c.has_iep,
+    students.c.last_iep_review,
+    teachers.c.subject,
+    teachers.c.room_number,
+    admins.c.department,
+]
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+def export_statement():
+    """Plain Core select over explicit columns, so no ORM objects are built"""
+    return select(*EXPORT_COLUMNS).select_from(
+        users
+        .outerjoin(profiles, profiles.c.user_id == users.c.id)
+        .outerjoin(students, students.c.id == profiles.c.id)
+        .outerjoin(teachers, teachers.c.id == profiles.c.id)
+        .outerjoin(admins, admins.c.id == profiles.c.id)
+    )
+
+async def export_users(
+    session_factory: async_sessionmaker,
+    fmt: str,
+    chunk_size: int
+) -> AsyncIterator[bytes]:
+    """Yield the export in chunks read from a server-side cursor.
+
+    Only one chunk of rows is held in memory at a time. The read runs in its
+    own session because the request's session is closed before a streaming
+    response body is sent.
+    """
+    if fmt == "csv":
+        yield _csv_chunk([EXPORT_FIELDS])
+
+    async with session_factory() as session:
+        result = await session.stream(
+            export_statement().execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.partitions(chunk_size):
+            if fmt == "csv":
+                yield _csv_chunk([[_csv_value(value) for value in row] for row in rows])
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(EXPORT_FIELDS, row)), default=_json_value) + "\n"
+                    for row in rows
+                ).encode()
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream incrementally into gzip format"""
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def _csv_chunk(rows: list) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+def _json_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
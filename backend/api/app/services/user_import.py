@@ -0,0 +1,270 @@
+import asyncio
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.hashing import password_hasher
+from app.core.security import pwd_context
+from app.models.ids import new_id
+from app.models.user import User
+from app.models.profiles import StudentProfile, TeacherProfile, UserType
+from app.schemas.user import StudentCreate, TeacherCreate
+
+IMPORT_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+ROLE_SCHEMAS = {"student": StudentCreate, "teacher": TeacherCreate}
+PROFILE_MODELS = {"student": StudentProfile, "teacher": TeacherProfile}
+PROFILE_TYPES = {"student": UserType.STUDENT, "teacher": UserType.TEACHER}
+CSV_USER_FIELDS = ("username", "email", "password")
+
+@dataclass
+class ImportRow:
+    number: int
+    record: Optional[dict] = None
+    error: Optional[str] = None
+
+@dataclass
+class ImportReport:
+    max_errors: int
+    processed: int = 0
+    created: int = 0
+    failed: int = 0
+    batches: int = 0
+    errors: list = field(default_factory=list)
+
+    def fail(self, row: int, error: str, username: Optional[str] = None) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "username": username, "error": error})
+
+    def summary(self) -> dict:
+        return {
+            "processed": self.processed,
+            "created": self.created,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines without buffering the whole body.
+
+    Lines stay undecoded so that a line that isn't UTF-8 can be reported as
+    a row error rather than aborting the import.
+    """
+    pending = b""
+    first = True
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if first:
+                line = line.removeprefix(codecs.BOM_UTF8)
+                first = False
+            yield line.rstrip(b"\r")
+    if first:
+        pending = pending.removeprefix(codecs.BOM_UTF8)
+    if pending:
+        yield pending.rstrip(b"\r")
+
+async def parse_rows(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[ImportRow]:
+    """Parse CSV (one record per line, with a header) or NDJSON into rows"""
+    header = None
+    number = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        if fmt == "csv" and header is None:
+            # A mangled header name just fails validation on every row
+            text = line.decode("utf-8", errors="replace")
+            header = [name.strip() for name in next(csv.reader([text]))]
+            continue
+
+        number += 1
+        try:
+            # UnicodeDecodeError is a ValueError, so bad bytes become a row error
+            text = line.decode("utf-8")
+            if fmt == "csv":
+                record = _csv_record(dict(zip(header, next(csv.reader([text])))))
+            else:
+                record = json.loads(text)
+                if not isinstance(record, dict):
+                    raise ValueError("Row is not a JSON object")
+        except (csv.Error, ValueError) as e:
+            yield ImportRow(number, error=str(e))
+            continue
+        yield ImportRow(number, record=record)
+
+def _csv_record(values: dict) -> dict:
+    """Nest flat CSV columns into the shape of the create schemas"""
+    record = {"role": values.pop("role", None)}
+    for name in CSV_USER_FIELDS:
+        record[name] = values.pop(name, None)
+    record["profile"] = {name: value for name, value in values.items() if value not in ("", None)}
+    return record
+
+class UserImporter:
+    """Creates users and profiles from parsed rows in large set-based batches"""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        batch_size: int,
+        max_errors: int,
+        on_progress: Optional[Callable[[ImportReport], Awaitable[None]]] = None
+    ) -> None:
+        self.db = db
+        self.batch_size = batch_size
+        self.on_progress = on_progress
+        self.report = ImportReport(max_errors=max_errors)
+        self._seen_usernames = set()
+        self._seen_emails = set()
+        # Leave the rest of the hashing queue free for interactive logins
+        self._hash_slots = asyncio.Semaphore(password_hasher.max_workers)
+
+    async def run(self, rows: AsyncIterator[ImportRow]) -> ImportReport:
+        batch = []
+        async for row in rows:
+            self.report.processed += 1
+            parsed = self._validate(row)
+            if parsed is not None:
+                batch.append(parsed)
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = []
+        if batch:
+            await self._flush(batch)
+        self.report.errors.sort(key=lambda error: error["row"])
+        return self.report
+
+    def _validate(self, row: ImportRow):
+        if row.error is not None:
+            self.report.fail(row.number, row.error)
+            return None
+        record = dict(row.record)
+        role = record.pop("role", None)
+        schema = ROLE_SCHEMAS.get(role)
+        if schema is None:
+            self.report.fail(row.number, f"Unknown role: {role}", record.get("username"))
+            return None
+        try:
+            user_in = schema.model_validate(record)
+        except ValidationError as e:
+            self.report.fail(row.number, _format_validation_error(e), record.get("username"))
+            return None
+
+        # Duplicates within the same import
+        if user_in.username in self._seen_usernames:
+            self.report.fail(row.number, "Duplicate username in import", user_in.username)
+            return None
+        if user_in.email in self._seen_emails:
+            self.report.fail(row.number, "Duplicate email in import", user_in.username)
+            return None
+        self._seen_usernames.add(user_in.username)
+        self._seen_emails.add(user_in.email)
+        return row.number, role, user_in
+
+    async def _flush(self, batch: list) -> None:
+        batch = await self._drop_existing(batch)
+        hashes = await asyncio.gather(
+            *(self._hash(user_in.password) for _, _, user_in in batch),
+            return_exceptions=True
+        )
+
+        users, profiles, ready = [], {role: [] for role in PROFILE_MODELS}, []
+        for (number, role, user_in), hashed in zip(batch, hashes):
+            if isinstance(hashed, Exception):
+                self.report.fail(number, "Password hashing failed", user_in.username)
+                continue
+            user_row, profile_row = _build_rows(role, user_in, hashed)
+            users.append(user_row)
+            profiles[role].append(profile_row)
+            ready.append((number, role, user_in.username, user_row, profile_row))
+
+        try:
+            if users:
+                await self.db.execute(insert(User), users)
+                for role, rows in profiles.items():
+                    if rows:
+                        await self.db.execute(insert(PROFILE_MODELS[role]), rows)
+            await self.db.commit()
+            self.report.created += len(ready)
+        except IntegrityError:
+            # Someone created a conflicting account since the duplicate check
+            await self.db.rollback()
+            await self._insert_one_by_one(ready)
+
+        self.report.batches += 1
+        if self.on_progress is not None:
+            await self.on_progress(self.report)
+
+    async def _drop_existing(self, batch: list) -> list:
+        """Fail rows whose username or email already exists, in one query"""
+        usernames = [user_in.username for _, _, user_in in batch]
+        emails = [user_in.email for _, _, user_in in batch]
+        result = await self.db.execute(
+            select(User.username, User.email).filter(
+                or_(User.username.in_(usernames), User.email.in_(emails))
+            )
+        )
+        taken_usernames, taken_emails = set(), set()
+        for username, email in result:
+            taken_usernames.add(username)
+            taken_emails.add(email)
+
+        remaining = []
+        for number, role, user_in in batch:
+            if user_in.username in taken_usernames:
+                self.report.fail(number, "Username already registered", user_in.username)
+            elif user_in.email in taken_emails:
+                self.report.fail(number, "Email already registered", user_in.username)
+            else:
+                remaining.append((number, role, user_in))
+        return remaining
+
+    async def _hash(self, password: str) -> str:
+        async with self._hash_slots:
+            return await password_hasher.run(pwd_context.hash, password)
+
+    async def _insert_one_by_one(self, ready: list) -> None:
+        for number, role, username, user_row, profile_row in ready:
+            try:
+                async with self.db.begin_nested():
+                    await self.db.execute(insert(User), [user_row])
+                    await self.db.execute(insert(PROFILE_MODELS[role]), [profile_row])
+                self.report.created += 1
+            except IntegrityError:
+                self.report.fail(number, "Username or email already registered", username)
+        await self.db.commit()
+
+def _build_rows(role: str, user_in, hashed_password: str) -> tuple:
+    user_id = new_id()
+    user_row = {
+        "id": user_id,
+        "username": user_in.username,
+        "email": user_in.email,
+        "hashed_password": hashed_password,
+        "is_active": True,
+    }
+    profile_row = {
+        "id": new_id(),
+        "user_id": user_id,
+        "user_type": PROFILE_TYPES[role],
+        **user_in.profile.model_dump(),
+    }
+    return user_row, profile_row
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
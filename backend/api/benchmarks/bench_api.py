@@ -0,0 +1,228 @@
+"""End-to-end API benchmark: throughput, latency percentiles and allocations.
+
+Drives the real app.main:app in-process through httpx's ASGI transport,
+against a temporary SQLite database and fakeredis (or a real Redis with
+--redis-url). Results can be written as JSON and compared to a baseline;
+the exit status is 1 when a scenario regressed beyond --tolerance.
+
+Run from backend/api:
+    python -m benchmarks.bench_api --requests 500 --concurrency 10 --output bench.json
+    python -m benchmarks.bench_api --baseline bench.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from uuid import uuid4
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.security import create_access_token, create_refresh_token, get_password_hash
+from app.core.user_cache import user_cache
+from app.db.routing import get_read_db
+from app.db.session import get_db, get_redis, get_sessionmaker
+from app.main import app
+from app.models import Base, User
+from app.models.profiles import AdminProfile, StudentProfile
+
+PASSWORD = "BenchPass123!"
+
+class Fixture:
+    """Seeded database, Redis and tokens shared by all scenarios"""
+
+    def __init__(self, sessions: async_sessionmaker, redis) -> None:
+        self.sessions = sessions
+        self.redis = redis
+        self.student_ids = []
+        self.created = itertools.count()
+
+    async def seed(self, users: int) -> None:
+        hashed = get_password_hash(PASSWORD)
+        async with self.sessions() as session:
+            self.admin_id = uuid4()
+            session.add(User(id=self.admin_id, username="admin", email="admin@school.edu", hashed_password=hashed))
+            session.add(AdminProfile(user_id=self.admin_id, first_name="A", last_name="Admin"))
+            for i in range(users):
+                user_id = uuid4()
+                self.student_ids.append(user_id)
+                session.add(User(id=user_id, username=f"student{i}", email=f"student{i}@school.edu", hashed_password=hashed))
+                session.add(StudentProfile(user_id=user_id, first_name="S", last_name=str(i), grade_level=6 + i % 3))
+            await session.commit()
+        self.admin_headers = {"Authorization": f"Bearer {create_access_token(self.admin_id)}"}
+        self.student_headers = {"Authorization": f"Bearer {create_access_token(self.student_ids[0])}"}
+        self.refresh_headers = {"Authorization": f"Bearer {create_refresh_token(self.student_ids[0])}"}
+
+def scenarios(fixture: Fixture) -> dict:
+    """Each scenario issues one request and returns the response"""
+    async def login(client, i):
+        return await client.post("/auth/login", data={"username": "student0", "password": PASSWORD})
+
+    async def users_me(client, i):
+        return await client.get("/users/me", headers=fixture.student_headers)
+
+    async def admin_get_user(client, i):
+        user_id = fixture.student_ids[i % len(fixture.student_ids)]
+        return await client.get(f"/users/{user_id}", headers=fixture.admin_headers)
+
+    async def create_student(client, i):
+        n = next(fixture.created)
+        return await client.post("/users/student", headers=fixture.admin_headers, json={
+            "username": f"new{n}",
+            "email": f"new{n}@school.edu",
+            "password": PASSWORD,
+            "profile": {"first_name": "N", "last_name": str(n), "grade_level": 7},
+        })
+
+    async def refresh(client, i):
+        return await client.post("/auth/refresh", headers=fixture.refresh_headers)
+
+    return {
+        "login": login,
+        "users_me": users_me,
+        "admin_get_user": admin_get_user,
+        "create_student": create_student,
+        "refresh": refresh,
+    }
+
+async def run_scenario(client: httpx.AsyncClient, scenario, requests: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    indexes = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in indexes:
+            start = time.perf_counter()
+            response = await scenario(client, i)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    # Allocations measured on a short sequential pass, since tracing slows everything down
+    samples = min(20, requests)
+    tracemalloc.start()
+    allocated = []
+    for i in range(samples):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await scenario(client, requests + i)
+        allocated.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": requests / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "peak_alloc_kib_per_request": statistics.mean(allocated) / 1024,
+    }
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return (scenario, metric, baseline, current) for every regression"""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append((name, "throughput_rps", previous["throughput_rps"], current["throughput_rps"]))
+        for metric in ("p95_ms", "p99_ms", "peak_alloc_kib_per_request"):
+            if current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append((name, metric, previous[metric], current[metric]))
+    return regressions
+
+async def main(args) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}",
+            connect_args={"timeout": 30}
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        if args.redis_url:
+            from redis.asyncio import Redis
+            redis = Redis.from_url(args.redis_url, decode_responses=True)
+        else:
+            from fakeredis import FakeAsyncRedis
+            redis = FakeAsyncRedis(decode_responses=True)
+
+        fixture = Fixture(sessions, redis)
+        await fixture.seed(args.users)
+
+        async def override_get_db():
+            async with sessions() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
+        app.dependency_overrides[get_redis] = lambda: redis
+        app.dependency_overrides[get_sessionmaker] = lambda: sessions
+
+        selected = scenarios(fixture)
+        if args.scenarios:
+            selected = {name: selected[name] for name in args.scenarios}
+
+        results = {
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "scenarios": {},
+        }
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                print(f"{'scenario':>15} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'KiB/req':>8} {'errors':>7}")
+                for name, scenario in selected.items():
+                    user_cache.clear()
+                    await scenario(client, 0)
+                    result = await run_scenario(client, scenario, args.requests, args.concurrency)
+                    results["scenarios"][name] = result
+                    print(
+                        f"{name:>15} {result['throughput_rps']:>9.1f} {result['p50_ms']:>8.2f} "
+                        f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                        f"{result['peak_alloc_kib_per_request']:>8.1f} {result['errors']:>7}"
+                    )
+        finally:
+            app.dependency_overrides.clear()
+            await redis.aclose()
+            await engine.dispose()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for name, metric, previous, current in regressions:
+            print(f"REGRESSION {name} {metric}: {previous:.2f} -> {current:.2f}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--users", type=int, default=200, help="students to seed")
+    parser.add_argument("--scenarios", nargs="*", help="subset of scenarios to run")
+    parser.add_argument("--redis-url", help="use a real Redis instead of fakeredis")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative regression")
+    sys.exit(asyncio.run(main(parser.parse_args())))
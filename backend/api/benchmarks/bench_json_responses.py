@@ -0,0 +1,62 @@
+"""Serialization cost of FastAPI's default response path versus the fast path.
+
+The default path re-validates the returned model against the route's
+response_model, runs jsonable_encoder and renders with stdlib json. The fast
+path renders the already-valid model once with pydantic-core.
+
+Run from backend/api:
+    python -m benchmarks.bench_json_responses --repeat 200
+"""
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.responses import PydanticJSONResponse
+from app.schemas.user import UserResponse
+
+def make_users(count: int) -> list:
+    return [
+        UserResponse(id=uuid4(), username=f"user{i}", email=f"user{i}@school.edu", is_active=True)
+        for i in range(count)
+    ]
+
+async def default_path(field, content) -> bytes:
+    encoded = await serialize_response(field=field, response_content=content)
+    return JSONResponse(encoded).body
+
+async def orjson_path(field, content) -> bytes:
+    encoded = await serialize_response(field=field, response_content=content)
+    return ORJSONResponse(encoded).body
+
+async def fast_path(field, content) -> bytes:
+    return PydanticJSONResponse(content).body
+
+async def main(repeat: int) -> None:
+    payloads = {
+        "single": (create_model_field("single", UserResponse), make_users(1)[0]),
+        "list-1000": (create_model_field("list", list[UserResponse]), make_users(1000)),
+    }
+    paths = {"default": default_path, "orjson": orjson_path, "pydantic-core": fast_path}
+
+    print(f"{'payload':>10} {'path':>14} {'us/op':>10} {'speedup':>8}")
+    for name, (field, content) in payloads.items():
+        baseline = None
+        for path_name, path in paths.items():
+            await path(field, content)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                await path(field, content)
+            per_op = (time.perf_counter() - start) / repeat * 1e6
+            baseline = baseline or per_op
+            print(f"{name:>10} {path_name:>14} {per_op:>10.1f} {baseline / per_op:>7.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.repeat))
@@ -0,0 +1,59 @@
+"""Login password-check throughput as the hashing pool grows.
+
+Run from backend/api:
+    python -m benchmarks.bench_password_hashing --logins 64
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from app.core.hashing import PasswordHasher
+from app.core.security import pwd_context
+
+async def measure(hasher: PasswordHasher, hashed: str, logins: int) -> float:
+    """Return verifications per second for a burst of concurrent logins"""
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        hasher.run(pwd_context.verify, "TestPass123!", hashed) for _ in range(logins)
+    ))
+    return logins / (time.perf_counter() - start)
+
+def measure_inline(hashed: str, logins: int) -> float:
+    """Verifications per second when bcrypt runs on the event loop thread"""
+    start = time.perf_counter()
+    for _ in range(logins):
+        pwd_context.verify("TestPass123!", hashed)
+    return logins / (time.perf_counter() - start)
+
+async def main(logins: int, max_workers: int) -> None:
+    hashed = pwd_context.hash("TestPass123!")
+    baseline = measure_inline(hashed, logins)
+    print(f"{'workers':>8} {'logins/s':>10} {'speedup':>8} {'p99 queue wait (s)':>20}")
+    print(f"{'inline':>8} {baseline:>10.1f} {1.0:>8.2f} {'-':>20}")
+
+    workers = 1
+    while workers <= max_workers:
+        hasher = PasswordHasher(max_workers=workers, max_queue=logins)
+        try:
+            throughput = await measure(hasher, hashed, logins)
+            waits = hasher.get_stats()["queue_wait_seconds"]
+        finally:
+            hasher.shutdown()
+        print(f"{workers:>8} {throughput:>10.1f} {throughput / baseline:>8.2f} {p99(waits):>20}")
+        workers *= 2
+
+def p99(snapshot: dict) -> str:
+    """Upper bucket bound containing the 99th percentile"""
+    target = snapshot["count"] * 0.99
+    for bound, count in snapshot["buckets"].items():
+        if count >= target:
+            return bound
+    return "+Inf"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64, help="concurrent logins per run")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.max_workers))
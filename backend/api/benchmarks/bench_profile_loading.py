@@ -0,0 +1,77 @@
+"""Query count and latency for loading a mixed roster with typed profiles.
+
+Run from backend/api:
+    python -m benchmarks.bench_profile_loading --users 5000
+"""
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import with_polymorphic
+from sqlalchemy.pool import StaticPool
+
+from app.db.loading import PROFILE_SUBCLASSES, select_users_with_profiles
+from app.models import Base, User
+from app.models.profiles import BaseProfile, StudentProfile, TeacherProfile, ParentProfile, AdminProfile
+
+async def seed(session: AsyncSession, count: int) -> None:
+    for i in range(count):
+        user = User(id=uuid4(), username=f"user{i}", email=f"user{i}@school.edu", hashed_password="x")
+        session.add(user)
+        kind = i % 10
+        if kind < 7:
+            profile = StudentProfile(user_id=user.id, first_name="S", last_name=str(i), grade_level=6 + i % 3)
+        elif kind < 9:
+            profile = ParentProfile(user_id=user.id, first_name="P", last_name=str(i))
+        elif i % 20 == 9:
+            profile = TeacherProfile(user_id=user.id, first_name="T", last_name=str(i), subject="ELA", room_number="1")
+        else:
+            profile = AdminProfile(user_id=user.id, first_name="A", last_name=str(i))
+        session.add(profile)
+    await session.commit()
+
+async def load_per_user(session: AsyncSession) -> list:
+    """Baseline: one profile query per user, as lazy loading would do"""
+    users = (await session.execute(select(User))).scalars().all()
+    profile = with_polymorphic(BaseProfile, PROFILE_SUBCLASSES)
+    for user in users:
+        await session.execute(select(profile).filter(profile.user_id == user.id))
+    return users
+
+async def load_with(mode: str, session: AsyncSession) -> list:
+    return (await session.execute(select_users_with_profiles(mode))).unique().scalars().all()
+
+async def main(count: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with sessions() as session:
+        await seed(session, count)
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    scenarios = {
+        "per-user": load_per_user,
+        "joined": lambda session: load_with("joined", session),
+        "selectin": lambda session: load_with("selectin", session),
+    }
+    print(f"{'strategy':>10} {'users':>7} {'queries':>8} {'seconds':>8}")
+    for name, loader in scenarios.items():
+        async with sessions() as session:
+            statements.clear()
+            start = time.perf_counter()
+            users = await loader(session)
+            elapsed = time.perf_counter() - start
+        print(f"{name:>10} {len(users):>7} {len(statements):>8} {elapsed:>8.3f}")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.users))
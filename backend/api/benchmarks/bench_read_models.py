@@ -0,0 +1,128 @@
+"""CPU time and allocations per read: ORM hydration versus Core read models.
+
+Each iteration does what a request handler does: open a session, run the
+query, build the response model and serialize it to JSON. The ORM path
+loads User and profile instances and re-validates them through the
+response schema; the read-model path maps Core rows straight into it.
+
+Run from backend/api:
+    python -m benchmarks.bench_read_models --iterations 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from uuid import uuid4
+
+import pydantic_core
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.loading import select_users_with_profiles
+from app.db.read_models import (
+    DEFAULT_LISTING_FIELDS,
+    select_listing,
+    select_user_with_profile,
+    user_list_items,
+    user_with_profile
+)
+from app.models import Base, User
+from app.models.profiles import StudentProfile
+from app.schemas.user import UserListItem, UserPage, UserWithProfileResponse
+
+async def seed(sessions: async_sessionmaker, count: int) -> list:
+    user_ids = []
+    async with sessions() as session:
+        for i in range(count):
+            user_id = uuid4()
+            user_ids.append(user_id)
+            session.add(User(id=user_id, username=f"user{i}", email=f"user{i}@school.edu", hashed_password="x"))
+            session.add(StudentProfile(
+                user_id=user_id, first_name="S", last_name=str(i), grade_level=6 + i % 3,
+                has_iep=i % 5 == 0, accommodations={"extended_time": True} if i % 5 == 0 else None
+            ))
+        await session.commit()
+    return user_ids
+
+def scenarios(user_ids: list, page_size: int) -> dict:
+    """name -> (orm read, read-model read); each takes a session and an iteration number"""
+    async def user_orm(session, i):
+        result = await session.execute(select_users_with_profiles().filter(User.id == user_ids[i % len(user_ids)]))
+        return UserWithProfileResponse.model_validate(result.unique().scalar_one())
+
+    async def user_read_model(session, i):
+        result = await session.execute(select_user_with_profile().filter(User.id == user_ids[i % len(user_ids)]))
+        return user_with_profile(result.one())
+
+    async def page_orm(session, i):
+        users = (await session.execute(
+            select_users_with_profiles().order_by(User.created_at, User.id).limit(page_size)
+        )).unique().scalars().all()
+        return UserPage(items=[
+            UserListItem(
+                id=user.id, username=user.username, email=user.email, is_active=user.is_active,
+                created_at=user.created_at, role=user.profile.type, first_name=user.profile.first_name,
+                last_name=user.profile.last_name, grade_level=getattr(user.profile, "grade_level", None)
+            )
+            for user in users
+        ])
+
+    # The same listing fields the ORM page fills in
+    listing_fields = DEFAULT_LISTING_FIELDS["admin"]
+
+    async def page_read_model(session, i):
+        users = User.__table__
+        rows = (await session.execute(
+            select_listing(listing_fields).order_by(users.c.created_at, users.c.id).limit(page_size)
+        )).all()
+        return UserPage(items=user_list_items(rows, listing_fields))
+
+    return {
+        "user-by-id": (user_orm, user_read_model),
+        f"page-of-{page_size}": (page_orm, page_read_model),
+    }
+
+async def measure(sessions: async_sessionmaker, read, iterations: int) -> tuple:
+    """(CPU microseconds, allocated KiB) per read"""
+    async def one(i):
+        async with sessions() as session:
+            pydantic_core.to_json(await read(session, i))
+
+    await one(0)
+    start = time.process_time()
+    for i in range(iterations):
+        await one(i)
+    cpu = (time.process_time() - start) / iterations
+
+    allocated = []
+    tracemalloc.start()
+    for i in range(min(50, iterations)):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await one(i)
+        allocated.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    return cpu * 1e6, statistics.mean(allocated) / 1024
+
+async def main(users: int, iterations: int, page_size: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    user_ids = await seed(sessions, users)
+
+    print(f"{'read':>12} {'path':>11} {'CPU us':>9} {'KiB':>8}")
+    for name, (orm, read_model) in scenarios(user_ids, page_size).items():
+        for path, read in (("orm", orm), ("read-model", read_model)):
+            cpu, kib = await measure(sessions, read, iterations)
+            print(f"{name:>12} {path:>11} {cpu:>9.0f} {kib:>8.1f}")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.iterations, args.page_size))
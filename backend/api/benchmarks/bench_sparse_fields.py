@@ -0,0 +1,82 @@
+"""Roster page cost by fieldset: time to fetch and serialize, and bytes sent.
+
+Seeds students with realistic IEP data (a paragraph of summary and JSON
+accommodations and goals), then pages through the listing the way
+GET /users does for a few ?fields= choices: everything, the admin and
+teacher defaults, and a names-only roster.
+
+Run from backend/api:
+    python -m benchmarks.bench_sparse_fields --users 5000 --page-size 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.read_models import DEFAULT_LISTING_FIELDS, LISTING_COLUMNS, select_listing, user_list_items
+from app.models import Base, User
+from app.models.profiles import BaseProfile, StudentProfile
+from app.schemas.user import UserPage
+
+FIELDSETS = {
+    "all": tuple(LISTING_COLUMNS),
+    "admin default": DEFAULT_LISTING_FIELDS["admin"],
+    "teacher default": DEFAULT_LISTING_FIELDS["teacher"],
+    "names only": ("first_name", "last_name", "grade_level"),
+}
+
+async def seed(conn, count: int) -> None:
+    for offset in range(0, count, 1000):
+        users, profiles, students = [], [], []
+        for i in range(offset, min(offset + 1000, count)):
+            user_id, profile_id = uuid4(), uuid4()
+            users.append({"id": user_id, "username": f"user{i}", "email": f"user{i}@school.edu", "hashed_password": "x"})
+            profiles.append({"id": profile_id, "user_id": user_id, "type": "student", "first_name": "S", "last_name": str(i)})
+            students.append({
+                "id": profile_id,
+                "grade_level": 6 + i % 3,
+                "has_iep": True,
+                "iep_summary": "Reads two grade levels below peers; benefits from audio support. " * 8,
+                "accommodations": {"extended_time": "1.5x", "audio": True, "seating": "front", "breaks": [15, 30, 45]},
+                "iep_goals": {f"goal_{g}": {"target": "Write a five-paragraph essay", "progress": g * 10} for g in range(6)},
+                "last_iep_review": datetime(2024, 9, 1),
+            })
+        await conn.execute(insert(User.__table__), users)
+        await conn.execute(insert(BaseProfile.__table__), profiles)
+        await conn.execute(insert(StudentProfile.__table__), students)
+
+async def main(count: int, page_size: int, repeat: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await seed(conn, count)
+
+    users = User.__table__
+    print(f"{'fieldset':>16} {'ms/page':>9} {'KiB/page':>9}")
+    async with engine.connect() as conn:
+        for name, fields in FIELDSETS.items():
+            stmt = select_listing(fields).order_by(users.c.created_at, users.c.id).limit(page_size)
+            timings, size = [], 0
+            for _ in range(repeat):
+                start = time.perf_counter()
+                rows = (await conn.execute(stmt)).all()
+                page = UserPage(items=user_list_items(rows, fields), next_cursor=None)
+                body = UserPage.__pydantic_serializer__.to_json(page, exclude_unset=True)
+                timings.append(time.perf_counter() - start)
+                size = len(body)
+            print(f"{name:>16} {statistics.median(timings) * 1000:>9.2f} {size / 1024:>9.1f}")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.page_size, args.repeat))
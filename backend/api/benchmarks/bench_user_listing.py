@@ -0,0 +1,69 @@
+"""Page latency for OFFSET versus keyset pagination of the user listing.
+
+Run from backend/api:
+    python -m benchmarks.bench_user_listing --users 200000 --page-size 20
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import insert, tuple_
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.loading import select_user_listing
+from app.models import Base, User
+
+async def seed(conn, count: int) -> None:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for offset in range(0, count, 10000):
+        await conn.execute(insert(User.__table__), [
+            {
+                "id": uuid4(),
+                "username": f"user{i}",
+                "email": f"user{i}@school.edu",
+                "hashed_password": "x",
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(offset, min(offset + 10000, count))
+        ])
+
+async def main(count: int, page_size: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await seed(conn, count)
+
+    users = User.__table__
+    ordered = select_user_listing().order_by(users.c.created_at, users.c.id).limit(page_size)
+    pages = [page for page in (1, 10, 100, 1000, 10000) if page * page_size <= count]
+
+    print(f"{'page':>7} {'offset ms':>10} {'keyset ms':>10}")
+    async with engine.connect() as conn:
+        for page in pages:
+            # The last row of the previous page, as a client's cursor would carry
+            skip = (page - 1) * page_size
+            after = None
+            if skip:
+                row = (await conn.execute(ordered.offset(skip - 1).limit(1))).one()
+                after = (row.created_at, row.id)
+
+            start = time.perf_counter()
+            await conn.execute(ordered.offset(skip))
+            offset_ms = (time.perf_counter() - start) * 1000
+
+            stmt = ordered if after is None else ordered.filter(tuple_(users.c.created_at, users.c.id) > after)
+            start = time.perf_counter()
+            await conn.execute(stmt)
+            keyset_ms = (time.perf_counter() - start) * 1000
+            print(f"{page:>7} {offset_ms:>10.2f} {keyset_ms:>10.2f}")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200000)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.page_size))
@@ -0,0 +1,100 @@
+"""Index size and row-load time for UUIDs stored as 36-char text versus 16-byte blobs.
+
+Builds two copies of a users/profiles pair in a scratch SQLite file, one
+with the old String-backed UUID column and one with UUIDType, then compares
+the size of their primary key and foreign key indexes and the time to load
+every row back as uuid.UUID.
+
+Run from backend/api:
+    python -m benchmarks.bench_uuid_storage --rows 200000
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from uuid import UUID, uuid4
+
+from sqlalchemy import Column, ForeignKey, Index, MetaData, String, Table, TypeDecorator, create_engine, insert, select, text
+
+from app.models.types import UUIDType
+
+class StringUUID(TypeDecorator):
+    """The previous storage: a dashed string parsed back with UUID()"""
+    impl = String(36)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else str(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else UUID(value)
+
+def build_tables(metadata: MetaData, prefix: str, uuid_type) -> tuple:
+    users = Table(
+        f"{prefix}_users", metadata,
+        Column("id", uuid_type, primary_key=True),
+        Column("username", String, nullable=False)
+    )
+    profiles = Table(
+        f"{prefix}_profiles", metadata,
+        Column("id", uuid_type, primary_key=True),
+        Column("user_id", uuid_type, ForeignKey(users.c.id)),
+        Index(f"ix_{prefix}_profiles_user_id", "user_id")
+    )
+    return users, profiles
+
+def index_bytes(conn, table: str) -> int:
+    """Bytes used by a table's indexes, including the implicit primary key index"""
+    return conn.execute(text(
+        "SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name IN "
+        "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table)"
+    ), {"table": table}).scalar_one()
+
+def time_load(conn, stmt, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(stmt).all()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main(rows: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'uuids.db'}")
+        metadata = MetaData()
+        variants = {
+            "text(36)": build_tables(metadata, "text", StringUUID),
+            "blob(16)": build_tables(metadata, "blob", UUIDType),
+        }
+        metadata.create_all(engine)
+
+        user_rows = [{"id": uuid4(), "username": f"user{i}"} for i in range(rows)]
+        profile_rows = [{"id": uuid4(), "user_id": row["id"]} for row in user_rows]
+        with engine.begin() as conn:
+            for users, profiles in variants.values():
+                conn.execute(insert(users), user_rows)
+                conn.execute(insert(profiles), profile_rows)
+
+        with engine.connect() as conn:
+            try:
+                conn.execute(text("SELECT 1 FROM dbstat LIMIT 1"))
+                has_dbstat = True
+            except Exception:
+                has_dbstat = False
+            print(f"{'storage':>10} {'index KiB':>10} {'load ms':>9} {'join ms':>9}")
+            for name, (users, profiles) in variants.items():
+                size = (index_bytes(conn, users.name) + index_bytes(conn, profiles.name)) / 1024 if has_dbstat else float("nan")
+                load = time_load(conn, select(users.c.id, users.c.username), repeat)
+                join = time_load(conn, select(profiles.c.id, users.c.id).join(users, profiles.c.user_id == users.c.id), repeat)
+                print(f"{name:>10} {size:>10.0f} {load * 1000:>9.1f} {join * 1000:>9.1f}")
+            if not has_dbstat:
+                print("(this SQLite build has no dbstat table, so index sizes are not shown)")
+        engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -7,6 +7,7 @@ import os
 from pathlib import Path
 from uuid import UUID, uuid4
 from redis.asyncio import Redis
+from fakeredis import FakeAsyncRedis
 from datetime import datetime, UTC
 
 # Set environment to testing before importing app
@@ -26,8 +27,12 @@ from app.models.profiles import (
 )
 
 from app.main import app
-from app.db.session import get_db, get_redis
+from app.db.session import get_db, get_redis, get_sessionmaker
+from app.db.routing import get_read_db
 from app.core.security import create_access_token, get_password_hash
+from app.core.user_cache import user_cache
+from app.core.guardian_cache import guardian_students_cache
+from tests.query_budget import QueryCounter
 
 # Use in-memory SQLite for testing
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -60,8 +65,9 @@ async def test_engine_fixture():
 @pytest_asyncio.fixture(scope="function")
 async def redis():
     """Create a fake Redis instance for testing"""
-    fake_redis = Redis.from_url("redis://localhost", decode_responses=True)
-    return fake_redis
+    fake_redis = FakeAsyncRedis(decode_responses=True)
+    yield fake_redis
+    await fake_redis.aclose()
 
 @pytest_asyncio.fixture(scope="function")
 async def db_session(test_engine_fixture) -> AsyncSession:
@@ -75,8 +81,18 @@ async def db_session(test_engine_fixture) -> AsyncSession:
         await session.rollback()
         await session.close()
 
+@pytest.fixture
+def query_counter(request, test_engine_fixture) -> QueryCounter:
+    """Counts statements per request; enforces @query_budget when the test has one"""
+    with QueryCounter(test_engine_fixture.sync_engine) as counter:
+        marker = request.node.get_closest_marker("query_budget")
+        if marker is not None:
+            counter.max_statements = marker.args[0]
+            counter.allow_repeats = marker.kwargs.get("allow_repeats", False)
+        yield counter
+
 @pytest_asyncio.fixture(scope="function")
-async def client(db_session: AsyncSession, redis: Redis) -> AsyncClient:
+async def client(db_session: AsyncSession, redis: Redis, query_counter: QueryCounter) -> AsyncClient:
     """Test client fixture that uses the db_session fixture"""
     async def override_get_db():
         yield db_session
@@ -85,9 +101,14 @@ async def client(db_session: AsyncSession, redis: Redis) -> AsyncClient:
         return redis
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     app.dependency_overrides[get_redis] = override_get_redis
+    app.dependency_overrides[get_sessionmaker] = lambda: TestingSessionLocal
+    user_cache.clear()
+    guardian_students_cache.clear()
     
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+    event_hooks = {"request": [query_counter.start_request], "response": [query_counter.end_request]}
+    async with AsyncClient(app=app, base_url="http://test", event_hooks=event_hooks) as ac:
         yield ac
     
     app.dependency_overrides.clear()
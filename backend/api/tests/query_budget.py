@@ -0,0 +1,59 @@
+from collections import Counter
+from typing import Optional
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+def query_budget(max_statements: int, allow_repeats: bool = False):
+    """Fail the test if any request it makes issues more than max_statements
+    SQL statements, or the same statement more than once (an N+1), unless
+    allow_repeats is set for handlers that loop on purpose"""
+    return pytest.mark.query_budget(max_statements, allow_repeats=allow_repeats)
+
+class QueryCounter:
+    """Records the statements each HTTP request issues against an engine"""
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.max_statements: Optional[int] = None
+        self.allow_repeats = True
+        self.statements = []
+        self.requests = []
+        self._in_request = False
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self._in_request:
+            self.statements.append(statement)
+
+    async def start_request(self, request) -> None:
+        self.statements = []
+        self._in_request = True
+
+    async def end_request(self, response) -> None:
+        self._in_request = False
+        request = response.request
+        self.requests.append((f"{request.method} {request.url.path}", self.statements))
+        self.check(f"{request.method} {request.url.path}", self.statements)
+
+    def check(self, label: str, statements: list) -> None:
+        if self.max_statements is not None and len(statements) > self.max_statements:
+            pytest.fail(
+                f"{label} issued {len(statements)} statements, budget is {self.max_statements}:\n"
+                + "\n".join(statements),
+                pytrace=False
+            )
+        if not self.allow_repeats:
+            repeated = [statement for statement, count in Counter(statements).items() if count > 1]
+            if repeated:
+                pytest.fail(
+                    f"{label} repeated statements (N+1?):\n" + "\n".join(repeated),
+                    pytrace=False
+                )
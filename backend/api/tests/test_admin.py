@@ -0,0 +1,161 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from uuid import uuid4
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import create_access_token
+from app.routers import admin
+from app.models.user import User
+from app.models.profiles import StudentProfile, TeacherProfile
+
+CSV_IMPORT = (
+    "role,username,email,password,first_name,last_name,grade_level,subject,room_number\n"
+    "student,stu1,stu1@school.edu,student123,Stu,One,6,,\n"
+    "teacher,tea1,tea1@school.edu,teacher123,Tea,One,,ELA,204\n"
+    "student,stu1,other@school.edu,student123,Dup,Name,7,,\n"
+    "student,stu2,stu2@school.edu,short,Bad,Password,7,,\n"
+    "janitor,jan1,jan1@school.edu,janitor123,Jan,One,,,\n"
+)
+
+@pytest.mark.asyncio
+async def test_bulk_import_csv(client: AsyncClient, admin_token: str, db_session: AsyncSession):
+    response = await client.post(
+        "/admin/users/bulk-import?import_id=term1",
+        content=CSV_IMPORT.encode(),
+        headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["processed"] == 5
+    assert report["created"] == 2
+    assert report["failed"] == 3
+    assert [error["row"] for error in report["errors"]] == [3, 4, 5]
+
+    result = await db_session.execute(select(StudentProfile).filter(StudentProfile.grade_level == 6))
+    assert result.scalar_one().first_name == "Stu"
+    result = await db_session.execute(select(TeacherProfile))
+    assert result.scalar_one().room_number == "204"
+
+    response = await client.get(
+        "/admin/users/bulk-import/term1",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.json()["status"] == "completed"
+    assert response.json()["created"] == 2
+
+@pytest.mark.asyncio
+async def test_bulk_import_ndjson_skips_existing_accounts(client: AsyncClient, admin_token: str, test_user_in_db: User):
+    rows = [
+        {"role": "student", "username": test_user_in_db.username, "email": "new@school.edu",
+         "password": "student123", "profile": {"first_name": "A", "last_name": "B", "grade_level": 8}},
+        {"role": "student", "username": "fresh", "email": "fresh@school.edu",
+         "password": "student123", "profile": {"first_name": "C", "last_name": "D", "grade_level": 8}},
+        "not an object",
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\n{broken"
+    response = await client.post(
+        "/admin/users/bulk-import",
+        content=body.encode(),
+        headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["created"] == 1
+    assert report["errors"][0]["error"] == "Username already registered"
+    assert len(report["errors"]) == 3
+
+@pytest.mark.asyncio
+async def test_bulk_import_reports_undecodable_rows(client: AsyncClient, admin_token: str):
+    body = (
+        "role,username,email,password,first_name,last_name,grade_level,subject,room_number\n".encode()
+        + "student,ren1,ren1@school.edu,student123,Ren\xe9e,One,6,,\n".encode("latin-1")
+        + b"student,ren2,ren2@school.edu,student123,Ren,Two,6,,\n"
+    )
+    response = await client.post(
+        "/admin/users/bulk-import",
+        content=body,
+        headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["created"] == 1
+    assert [error["row"] for error in report["errors"]] == [1]
+
+@pytest.mark.asyncio
+async def test_bulk_import_failure_is_recorded(client: AsyncClient, admin_token: str, monkeypatch):
+    parse_rows = admin.parse_rows
+
+    async def failing_rows(chunks, fmt):
+        async for row in parse_rows(chunks, fmt):
+            yield row
+        raise RuntimeError("stream broke")
+
+    monkeypatch.setattr(admin, "parse_rows", failing_rows)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    with pytest.raises(RuntimeError):
+        await client.post(
+            "/admin/users/bulk-import?import_id=broken",
+            content=CSV_IMPORT.encode(),
+            headers={**headers, "Content-Type": "text/csv"}
+        )
+    monkeypatch.undo()
+
+    response = await client.get("/admin/users/bulk-import/broken", headers=headers)
+    progress = response.json()
+    assert progress["status"] == "failed"
+    assert progress["processed"] == 5
+
+@pytest.mark.asyncio
+async def test_bulk_import_rejects_unknown_format(client: AsyncClient, admin_token: str):
+    response = await client.post(
+        "/admin/users/bulk-import",
+        content=b"<users/>",
+        headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "application/xml"}
+    )
+    assert response.status_code == 415
+
+@pytest.mark.asyncio
+async def test_bulk_import_requires_admin(client: AsyncClient, test_user_in_db: User):
+    token = create_access_token(test_user_in_db.id)
+    response = await client.post(
+        "/admin/users/bulk-import",
+        content=CSV_IMPORT.encode(),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "text/csv"}
+    )
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_bulk_export_csv(client: AsyncClient, admin_token: str, db_session: AsyncSession):
+    user_id = uuid4()
+    db_session.add(User(id=user_id, username="stu", email="stu@school.edu", hashed_password="x", is_active=True))
+    db_session.add(StudentProfile(user_id=user_id, first_name="Stu", last_name="Dent", grade_level=7))
+    await db_session.commit()
+
+    response = await client.get(
+        "/admin/users/bulk-export",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = {row["username"]: row for row in csv.DictReader(io.StringIO(response.text))}
+    assert set(rows) == {"admin", "stu"}
+    assert rows["stu"]["role"] == "student"
+    assert rows["stu"]["grade_level"] == "7"
+    assert rows["admin"]["department"] == "IT"
+    assert "hashed_password" not in rows["stu"]
+
+@pytest.mark.asyncio
+async def test_bulk_export_ndjson_gzip(client: AsyncClient, admin_token: str):
+    response = await client.get(
+        "/admin/users/bulk-export?format=ndjson&compress=true",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    lines = gzip.decompress(response.content).decode().splitlines()
+    assert [json.loads(line)["username"] for line in lines] == ["admin"]
@@ -8,6 +8,7 @@ from app.main import app
 from app.core.security import create_access_token, create_refresh_token, get_password_hash
 from app.models.user import User
 from app.core.config import settings
+from tests.query_budget import query_budget
 
 @pytest.fixture
 def test_user_data():
@@ -34,6 +35,7 @@ async def test_user_in_db(test_user_data, db_session):
     return user
 
 @pytest.mark.asyncio
+@query_budget(1)
 async def test_login_success(client: AsyncClient, test_user_in_db: User, test_user_data: dict):
     """Test successful login with valid credentials"""
     response = await client.post(
@@ -51,6 +53,7 @@ async def test_login_success(client: AsyncClient, test_user_in_db: User, test_us
     assert isinstance(data["expires_in"], int)
 
 @pytest.mark.asyncio
+@query_budget(1)
 async def test_login_invalid_password(client: AsyncClient, test_user_in_db: User, test_user_data: dict):
     """Test login with invalid password"""
     response = await client.post(
@@ -64,6 +67,7 @@ async def test_login_invalid_password(client: AsyncClient, test_user_in_db: User
     assert "detail" in response.json()
 
 @pytest.mark.asyncio
+@query_budget(1)
 async def test_login_invalid_username(client: AsyncClient, test_user_in_db: User):
     """Test login with non-existent username"""
     response = await client.post(
@@ -107,6 +111,7 @@ async def test_protected_route_invalid_token(client: AsyncClient):
     assert "detail" in response.json()
 
 @pytest.mark.asyncio
+@query_budget(1)
 async def test_refresh_token_success(client: AsyncClient, test_user_in_db: User):
     """Test successful token refresh"""
     refresh_token = create_refresh_token(test_user_in_db.id)
@@ -146,6 +151,7 @@ async def test_expired_token(client: AsyncClient, test_user_in_db: User):
     assert "detail" in response.json()
 
 @pytest.mark.asyncio
+@query_budget(2)
 async def test_logout(client: AsyncClient, test_user_in_db: User):
     """Test logout functionality"""
     # First get a valid token
@@ -170,4 +176,47 @@ async def test_logout(client: AsyncClient, test_user_in_db: User):
         "/users/me",
         headers={"Authorization": f"Bearer {token}"}
     )
-    assert response.status_code == 401 
\ No newline at end of file
+    assert response.status_code == 401 
+
+@pytest.mark.asyncio
+@query_budget(2)
+async def test_revoke_all_sessions(client: AsyncClient, test_user_in_db: User, test_user_data: dict):
+    """Test that bumping the session generation revokes every outstanding token"""
+    access_token = create_access_token(test_user_in_db.id)
+    refresh_token = create_refresh_token(test_user_in_db.id)
+
+    response = await client.post(
+        f"/users/{test_user_in_db.id}/sessions/revoke",
+        headers={"Authorization": f"Bearer {access_token}"}
+    )
+    assert response.status_code == 204
+
+    response = await client.get("/users/me", headers={"Authorization": f"Bearer {access_token}"})
+    assert response.status_code == 401
+    response = await client.post("/auth/refresh", headers={"Authorization": f"Bearer {refresh_token}"})
+    assert response.status_code == 401
+
+    # Fresh logins carry the new generation
+    response = await client.post(
+        "/auth/login",
+        data={"username": test_user_data["username"], "password": test_user_data["password"]}
+    )
+    assert response.status_code == 200
+    new_token = response.json()["access_token"]
+    response = await client.get("/users/me", headers={"Authorization": f"Bearer {new_token}"})
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+@query_budget(3)
+async def test_deactivation_revokes_refresh_token(client: AsyncClient, admin_token: str, test_user_in_db: User):
+    """Test that deactivating a user invalidates their refresh tokens"""
+    refresh_token = create_refresh_token(test_user_in_db.id)
+    response = await client.put(
+        f"/users/{test_user_in_db.id}",
+        json={"is_active": False},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+
+    response = await client.post("/auth/refresh", headers={"Authorization": f"Bearer {refresh_token}"})
+    assert response.status_code == 401
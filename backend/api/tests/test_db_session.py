@@ -0,0 +1,104 @@
+import pytest
+from uuid import uuid4
+from redis.asyncio import Redis
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool, StaticPool
+
+from app.core.config import settings
+from app.db import session as session_module
+from app.db.pool import InstrumentedAsyncQueuePool
+from app.db.routing import get_read_db, mark_recent_write, reads_from_replica
+from app.db.session import (
+    create_engine_from_settings,
+    get_async_db_url,
+    get_connect_args,
+    get_engine_options,
+    get_pool_stats,
+    get_redis
+)
+from app.main import app
+
+def test_memory_sqlite_uses_static_pool():
+    assert get_engine_options("sqlite+aiosqlite:///:memory:")["poolclass"] is StaticPool
+
+def test_async_db_url_rewrites_sync_drivers():
+    assert get_async_db_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert get_async_db_url("postgresql://u:p@db:5432/scribex") == "postgresql+asyncpg://u:p@db:5432/scribex"
+    assert get_async_db_url("postgres://db/scribex") == "postgresql+asyncpg://db/scribex"
+    assert get_async_db_url("postgresql+psycopg2://db/scribex") == "postgresql+asyncpg://db/scribex"
+    assert get_async_db_url("postgresql+asyncpg://db/scribex") == "postgresql+asyncpg://db/scribex"
+
+def test_asyncpg_statement_cache_size(monkeypatch):
+    monkeypatch.setattr(settings, "DB_STATEMENT_CACHE_SIZE", 0)
+    connect_args = get_connect_args("postgresql+asyncpg://db/scribex")
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+    monkeypatch.setattr(settings, "DB_STATEMENT_CACHE_SIZE", 100)
+    assert "prepared_statement_name_func" not in get_connect_args("postgresql+asyncpg://db/scribex")
+    assert get_connect_args("sqlite+aiosqlite:///:memory:") == {}
+
+def test_null_pool_mode(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_MODE", "null")
+    assert get_engine_options("postgresql+asyncpg://db/scribex")["poolclass"] is NullPool
+
+def test_queue_pool_options(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_POOL_MAX_OVERFLOW", 2)
+    options = get_engine_options("postgresql+asyncpg://db/scribex")
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["pool_size"] == 3
+    assert options["max_overflow"] == 2
+    assert options["pool_pre_ping"] is settings.DB_POOL_PRE_PING
+
+@pytest.mark.asyncio
+async def test_pool_stats_track_checkouts(tmp_path):
+    engine = create_engine_from_settings(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            stats = get_pool_stats(engine)
+            assert stats["pool_class"] == "InstrumentedAsyncQueuePool"
+            assert stats["checked_out"] == 1
+
+        stats = get_pool_stats(engine)
+        assert stats["checked_out"] == 0
+        assert stats["checked_in"] == 1
+        assert stats["wait_seconds"]["count"] >= 1
+        assert stats["wait_seconds"]["buckets"]["+Inf"] == stats["wait_seconds"]["count"]
+    finally:
+        await engine.dispose()
+
+def test_redis_client_is_async_and_pooled():
+    client = get_redis()
+    assert isinstance(client, Redis)
+    pool = client.connection_pool
+    assert pool.max_connections == settings.REDIS_MAX_CONNECTIONS
+    assert pool.connection_kwargs["socket_timeout"] == settings.REDIS_SOCKET_TIMEOUT_SECONDS
+    assert pool.connection_kwargs["health_check_interval"] == settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS
+
+@pytest.mark.asyncio
+async def test_reads_use_primary_without_replica(redis):
+    user_id = uuid4()
+    await mark_recent_write(redis, user_id)
+    assert await redis.keys("recent-write:*") == []
+    assert not await reads_from_replica(redis, user_id)
+
+@pytest.mark.asyncio
+async def test_reads_follow_own_writes_to_primary(redis, monkeypatch):
+    monkeypatch.setattr(session_module, "replica_engine", object())
+    writer, reader = uuid4(), uuid4()
+
+    await mark_recent_write(redis, writer)
+    assert 0 < await redis.pttl(f"recent-write:{writer}") <= 5000
+    assert not await reads_from_replica(redis, writer)
+    assert await reads_from_replica(redis, reader)
+
+@pytest.mark.asyncio
+async def test_read_db_uses_get_db_without_replica(client, admin_token: str):
+    # Overriding get_db alone must be enough when reads stay on the primary
+    app.dependency_overrides.pop(get_read_db)
+    response = await client.get("/users/me", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
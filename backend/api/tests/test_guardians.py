@@ -0,0 +1,137 @@
+import pytest
+from redis.exceptions import RedisError
+from httpx import AsyncClient
+from uuid import uuid4
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import guardian_cache
+from app.core.guardian_cache import (
+    GUARDIAN_STUDENTS_KEY_PREFIX,
+    get_guardian_student_ids,
+    guardian_students_cache,
+    invalidate_guardian
+)
+from app.core.security import create_access_token
+from app.models.user import User
+from app.models.profiles import ParentProfile, StudentProfile
+
+async def add_user(db_session: AsyncSession, profile) -> User:
+    user = User(id=uuid4(), username=f"user-{uuid4().hex[:8]}", email=f"{uuid4().hex[:8]}@school.edu", hashed_password="x")
+    profile.user_id = user.id
+    db_session.add(user)
+    db_session.add(profile)
+    await db_session.commit()
+    return user
+
+@pytest.mark.asyncio
+async def test_guardian_progress_authorization(client: AsyncClient, admin_token: str, db_session: AsyncSession, redis, query_counter):
+    guardian = await add_user(db_session, ParentProfile(first_name="P", last_name="G"))
+    student = await add_user(db_session, StudentProfile(first_name="S", last_name="K", grade_level=7, has_iep=True))
+    other = await add_user(db_session, StudentProfile(first_name="O", last_name="K", grade_level=8))
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    headers = {"Authorization": f"Bearer {create_access_token(guardian.id)}"}
+    progress = f"/guardians/{guardian.id}/students/{student.id}/progress"
+
+    response = await client.get(progress, headers=headers)
+    assert response.status_code == 403
+
+    response = await client.put(f"/guardians/{guardian.id}/students/{student.id}", headers=admin_headers)
+    assert response.status_code == 204
+    # Linking again is a no-op
+    response = await client.put(f"/guardians/{guardian.id}/students/{student.id}", headers=admin_headers)
+    assert response.status_code == 204
+
+    response = await client.get(progress, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["grade_level"] == 7
+    assert await redis.get(f"{GUARDIAN_STUDENTS_KEY_PREFIX}{guardian.id}") == str(student.id)
+
+    # Warm cache: the only query left is the progress read itself
+    response = await client.get(progress, headers=headers)
+    assert response.status_code == 200
+    assert len(query_counter.requests[-1][1]) == 1
+
+    # Another worker's empty local cache is filled from Redis, not the database
+    guardian_students_cache.clear()
+    response = await client.get(f"/guardians/{guardian.id}/students/{other.id}/progress", headers=headers)
+    assert response.status_code == 403
+    assert len(query_counter.requests[-1][1]) == 0
+
+    response = await client.get(f"/guardians/{guardian.id}/students/{student.id}/progress", headers={
+        "Authorization": f"Bearer {create_access_token(other.id)}"
+    })
+    assert response.status_code == 403
+
+    response = await client.delete(f"/guardians/{guardian.id}/students/{student.id}", headers=admin_headers)
+    assert response.status_code == 204
+    assert await redis.get(f"{GUARDIAN_STUDENTS_KEY_PREFIX}{guardian.id}") is None
+    response = await client.get(progress, headers=headers)
+    assert response.status_code == 403
+
+    response = await client.delete(f"/guardians/{guardian.id}/students/{student.id}", headers=admin_headers)
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_link_requires_guardian_and_student(client: AsyncClient, admin_token: str, db_session: AsyncSession):
+    student = await add_user(db_session, StudentProfile(first_name="S", last_name="K", grade_level=7))
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await client.put(f"/guardians/{student.id}/students/{student.id}", headers=headers)
+    assert response.status_code == 404
+
+async def linked_guardian(client: AsyncClient, admin_token: str, db_session: AsyncSession):
+    guardian = await add_user(db_session, ParentProfile(first_name="P", last_name="G"))
+    student = await add_user(db_session, StudentProfile(first_name="S", last_name="K", grade_level=7))
+    response = await client.put(
+        f"/guardians/{guardian.id}/students/{student.id}",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 204
+    return guardian, student
+
+@pytest.mark.asyncio
+async def test_load_racing_unlink_is_not_cached(client: AsyncClient, admin_token: str, db_session: AsyncSession, redis, monkeypatch):
+    guardian, student = await linked_guardian(client, admin_token, db_session)
+
+    # The link is removed and invalidated after the load read it
+    load = guardian_cache.load_guardian_student_ids
+    async def load_then_unlink(db, guardian_id):
+        student_ids = await load(db, guardian_id)
+        await invalidate_guardian(redis, guardian_id)
+        return student_ids
+    monkeypatch.setattr(guardian_cache, "load_guardian_student_ids", load_then_unlink)
+
+    assert await get_guardian_student_ids(db_session, redis, guardian.id) == {student.id}
+    assert await redis.get(f"{GUARDIAN_STUDENTS_KEY_PREFIX}{guardian.id}") is None
+    assert guardian_students_cache.get(guardian.id) is None
+
+    # The next load is cached as usual
+    monkeypatch.setattr(guardian_cache, "load_guardian_student_ids", load)
+    assert await get_guardian_student_ids(db_session, redis, guardian.id) == {student.id}
+    assert await redis.get(f"{GUARDIAN_STUDENTS_KEY_PREFIX}{guardian.id}") == str(student.id)
+
+@pytest.mark.asyncio
+async def test_invalidation_during_redis_read_is_not_undone_locally(client: AsyncClient, admin_token: str, db_session: AsyncSession, redis, monkeypatch):
+    guardian, student = await linked_guardian(client, admin_token, db_session)
+    await get_guardian_student_ids(db_session, redis, guardian.id)
+    guardian_students_cache.clear()
+
+    # Another worker unlinks after this one read the old set from Redis
+    mget = redis.mget
+    async def mget_then_invalidate(*keys):
+        values = await mget(*keys)
+        await invalidate_guardian(redis, guardian.id)
+        return values
+    monkeypatch.setattr(redis, "mget", mget_then_invalidate)
+
+    assert await get_guardian_student_ids(db_session, redis, guardian.id) == {student.id}
+    assert guardian_students_cache.get(guardian.id) is None
+
+@pytest.mark.asyncio
+async def test_set_not_cached_in_redis_is_not_cached_locally(client: AsyncClient, admin_token: str, db_session: AsyncSession, redis, monkeypatch):
+    guardian, student = await linked_guardian(client, admin_token, db_session)
+    def broken_pipeline(*args, **kwargs):
+        raise RedisError("connection lost")
+    monkeypatch.setattr(redis, "pipeline", broken_pipeline)
+
+    assert await get_guardian_student_ids(db_session, redis, guardian.id) == {student.id}
+    assert guardian_students_cache.get(guardian.id) is None
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+import pytest
+
+from app.core.hashing import PasswordHasher, HasherSaturatedError
+from app.core.security import get_password_hash_async, verify_password_async
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_off_loop():
+    hashed = await get_password_hash_async("TestPass123!")
+    assert await verify_password_async("TestPass123!", hashed)
+    assert not await verify_password_async("wrong", hashed)
+
+@pytest.mark.asyncio
+async def test_hasher_records_metrics():
+    hasher = PasswordHasher(max_workers=1, max_queue=0)
+    try:
+        assert await hasher.run(lambda value: value * 2, 21) == 42
+        stats = hasher.get_stats()
+        assert stats["pending"] == 0
+        assert stats["hash_seconds"]["count"] == 1
+        assert stats["queue_wait_seconds"]["count"] == 1
+    finally:
+        hasher.shutdown()
+
+@pytest.mark.asyncio
+async def test_hasher_rejects_when_saturated():
+    hasher = PasswordHasher(max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        blocked = [asyncio.create_task(hasher.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(HasherSaturatedError):
+            await hasher.run(release.wait)
+        assert hasher.rejected.value == 1
+
+        release.set()
+        await asyncio.gather(*blocked)
+        assert hasher.pending == 0
+    finally:
+        release.set()
+        hasher.shutdown()
+
+@pytest.mark.asyncio
+async def test_hasher_restarts_after_shutdown():
+    # Each app lifespan shuts the shared hasher down; the next one must still hash
+    hasher = PasswordHasher(max_workers=1)
+    try:
+        assert await hasher.run(lambda: 1) == 1
+        hasher.shutdown()
+        assert await hasher.run(lambda: 2) == 2
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,45 @@
+import time
+from uuid import RFC_4122, UUID
+
+from app.models import ids
+from app.models.ids import UUID7Generator, new_id, set_id_generator
+
+def test_uuid7_layout():
+    before = time.time_ns() // 1_000_000
+    value = UUID7Generator()()
+    after = time.time_ns() // 1_000_000
+    assert value.version == 7
+    assert value.variant == RFC_4122
+    assert before <= value.int >> 80 <= after
+    assert UUID(str(value)) == value
+
+def test_uuid7_is_monotonic_within_a_millisecond():
+    generate = UUID7Generator()
+    values = [generate() for _ in range(10000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+def test_uuid7_survives_clock_going_back(monkeypatch):
+    generate = UUID7Generator()
+    first = generate()
+    monkeypatch.setattr(time, "time_ns", lambda: 0)
+    assert generate() > first
+
+def test_uuid7_counter_overflow_moves_to_next_millisecond(monkeypatch):
+    monkeypatch.setattr(time, "time_ns", lambda: 1_700_000_000_000_000_000)
+    generate = UUID7Generator()
+    first = generate()
+    generate._counter = ids._COUNTER_MAX
+    second = generate()
+    assert second > first
+    assert second.int >> 80 == (first.int >> 80) + 1
+
+def test_id_generator_is_pluggable():
+    try:
+        set_id_generator("uuid4")
+        assert new_id().version == 4
+        set_id_generator(lambda: UUID(int=1))
+        assert new_id() == UUID(int=1)
+    finally:
+        set_id_generator("uuid7")
+    assert new_id().version == 7
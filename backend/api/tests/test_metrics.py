@@ -0,0 +1,38 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.instrumentation import http_request_db_statements, instrument_engine
+from app.core.metrics import MetricFamily
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client: AsyncClient, admin_token: str, db_session: AsyncSession):
+    instrument_engine(db_session.bind.sync_engine)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    statements = http_request_db_statements.labels("GET", "/users/{user_id}")
+    before = statements.sum
+
+    response = await client.get(f"/users/{'0' * 32}", headers=headers)
+    assert response.status_code == 404
+    assert statements.count >= 1
+    assert statements.sum - before >= 1
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/users/{user_id}",status="404"}' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/users/{user_id}",le="+Inf"}' in body
+    assert "db_statement_duration_seconds_count" in body
+    assert "user_cache_hits" in body
+    assert "password_hasher_hash_seconds_count" in body
+
+def test_metric_family_caps_series():
+    family = MetricFamily("requests_total", "Requests", "counter", ("route",), max_series=2)
+    family.labels("/a").inc()
+    family.labels("/b").inc()
+    family.labels("/c").inc()
+    family.labels("/d").inc()
+    assert family.labels("/a").value == 1
+    assert family.labels("other").value == 2
+    assert 'requests_total{route="other"} 2' in family.render()
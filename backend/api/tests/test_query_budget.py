@@ -0,0 +1,23 @@
+import pytest
+
+from tests.query_budget import QueryCounter
+
+def test_budget_exceeded_fails():
+    counter = QueryCounter(engine=None)
+    counter.max_statements = 1
+    with pytest.raises(pytest.fail.Exception, match="issued 2 statements, budget is 1"):
+        counter.check("GET /users/me", ["SELECT 1", "SELECT 2"])
+
+def test_repeated_statement_fails():
+    counter = QueryCounter(engine=None)
+    counter.max_statements = 10
+    counter.allow_repeats = False
+    statements = ["SELECT users.id FROM users", "SELECT profiles.id FROM profiles WHERE ?"] + \
+        ["SELECT profiles.id FROM profiles WHERE ?"] * 2
+    with pytest.raises(pytest.fail.Exception, match="N\\+1"):
+        counter.check("GET /users", statements)
+
+def test_repeats_allowed():
+    counter = QueryCounter(engine=None)
+    counter.max_statements = 3
+    counter.check("POST /users/students:batch", ["INSERT INTO users VALUES (?)"] * 3)
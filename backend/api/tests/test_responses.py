@@ -0,0 +1,35 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core.responses import PydanticJSONResponse, model_response
+from app.schemas.user import UserPage
+
+@pytest.mark.asyncio
+async def test_fast_responses_match_default(client: AsyncClient, admin_token: str, student_data: dict, monkeypatch):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    default = [
+        (await client.get("/users/me", headers=headers)).json(),
+        (await client.get("/users", headers=headers)).json(),
+    ]
+
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    fast = [
+        (await client.get("/users/me", headers=headers)).json(),
+        (await client.get("/users", headers=headers)).json(),
+    ]
+    assert fast == default
+
+    response = await client.post("/users/student", json=student_data, headers=headers)
+    assert response.status_code == 201
+    assert response.json()["username"] == student_data["username"]
+
+def test_model_response_modes(monkeypatch):
+    page = UserPage(items=[])
+    assert model_response(page) is page
+
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    response = model_response(page, status_code=201)
+    assert isinstance(response, PydanticJSONResponse)
+    assert response.status_code == 201
+    assert response.body == b'{"items":[],"next_cursor":null}'
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from uuid import uuid4
+import pytest
+from httpx import AsyncClient
+from jose import jwt
+
+from app.core import revocation
+from app.core.config import settings
+from app.core.revocation import BloomFilter, is_token_revoked, rebuild_revocation_filter, listen_for_revocations
+from app import main
+from app.core.security import create_access_token, create_refresh_token, decode_token
+from app.models.user import User
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"jti-{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_hits = sum(f"other-{i}" in bloom for i in range(1000))
+    assert false_hits < 50
+
+def test_tokens_carry_distinct_jti():
+    user_id = uuid4()
+    first = decode_token(create_access_token(user_id), "access")
+    second = decode_token(create_access_token(user_id), "access")
+    assert first["jti"] != second["jti"]
+    assert decode_token(create_refresh_token(user_id), "refresh")["jti"]
+
+def test_token_without_jti_rejected():
+    token = jwt.encode(
+        {"exp": time.time() + 60, "sub": str(uuid4()), "type": "access"},
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM
+    )
+    with pytest.raises(ValueError):
+        decode_token(token, "access")
+
+@pytest.mark.asyncio
+async def test_unrevoked_check_skips_redis(redis):
+    skips = revocation.filter_skips.value
+    assert not await is_token_revoked(redis, "never-revoked")
+    assert revocation.filter_skips.value == skips + 1
+
+@pytest.mark.asyncio
+async def test_logout_revokes_by_jti_with_remaining_ttl(client: AsyncClient, test_user_in_db: User, redis):
+    token = create_access_token(test_user_in_db.id)
+    other_token = create_access_token(test_user_in_db.id)
+    claims = decode_token(token, "access")
+
+    response = await client.post("/auth/logout", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+
+    ttl = await redis.ttl(f"revoked:{claims['jti']}")
+    assert 0 < ttl <= settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60 + 1
+    assert await redis.get(f"blacklist:{token}") is None
+
+    response = await client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+    response = await client.get("/users/me", headers={"Authorization": f"Bearer {other_token}"})
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_rebuild_loads_revocations_from_redis(redis):
+    await redis.set("revoked:from-other-worker", "1", ex=60)
+    await rebuild_revocation_filter(redis)
+    assert await is_token_revoked(redis, "from-other-worker")
+
+@pytest.mark.asyncio
+async def test_listener_applies_broadcast_revocations(redis):
+    listener = asyncio.create_task(listen_for_revocations(redis))
+    try:
+        await asyncio.sleep(0.05)
+        await redis.set("revoked:broadcast-jti", "1", ex=60)
+        await redis.publish("token-revocations", "broadcast-jti")
+        for _ in range(100):
+            if "broadcast-jti" in revocation.revocation_filter:
+                break
+            await asyncio.sleep(0.01)
+        assert "broadcast-jti" in revocation.revocation_filter
+    finally:
+        listener.cancel()
+
+@pytest.mark.asyncio
+async def test_token_revoked_before_startup_rejected_on_first_request(
+    client: AsyncClient, test_user_in_db: User, redis, monkeypatch
+):
+    token = create_access_token(test_user_in_db.id)
+    # Revoked by another worker before this one started with an empty filter
+    await redis.set(f"revoked:{decode_token(token, 'access')['jti']}", "1", ex=60)
+    monkeypatch.setattr(revocation, "revocation_filter", revocation.new_filter())
+
+    async def no_connections():
+        pass
+    monkeypatch.setattr(main, "open_connections", no_connections)
+    monkeypatch.setattr(main, "close_connections", no_connections)
+    monkeypatch.setattr(main, "redis_client", redis)
+    async with main.lifespan(main.app):
+        response = await client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
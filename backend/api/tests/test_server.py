@@ -0,0 +1,22 @@
+import os
+
+from app.core.config import settings
+from app.main import create_app
+from app.server import gunicorn_options
+
+def test_create_app_builds_independent_apps():
+    first, second = create_app(), create_app()
+    assert first is not second
+    paths = {route.path for route in first.routes}
+    assert {"/health", "/metrics", "/users/me", "/auth/login", "/admin/users/bulk-export"} <= paths
+
+def test_gunicorn_options(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_WORKERS", None)
+    monkeypatch.setattr(settings, "SERVER_MAX_REQUESTS", 1000)
+    options = gunicorn_options()
+    assert options["workers"] == (os.cpu_count() or 1)
+    assert options["worker_class"] == "uvicorn.workers.UvicornWorker"
+    assert options["max_requests_jitter"] == 100
+
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 3)
+    assert gunicorn_options()["workers"] == 3
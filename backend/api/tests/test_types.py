@@ -0,0 +1,32 @@
+import pytest
+from uuid import uuid4
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.types import uuid_from_bytes
+from app.models.user import User
+from app.models.profiles import StudentProfile
+
+def test_uuid_from_bytes_matches_uuid():
+    value = uuid4()
+    rebuilt = uuid_from_bytes(value.bytes)
+    assert rebuilt == value
+    assert hash(rebuilt) == hash(value)
+    assert str(rebuilt) == str(value)
+    assert uuid_from_bytes(None) is None
+
+@pytest.mark.asyncio
+async def test_uuids_stored_as_16_bytes(db_session: AsyncSession):
+    user_id = uuid4()
+    db_session.add(User(id=user_id, username="blob", email="blob@school.edu", hashed_password="x"))
+    db_session.add(StudentProfile(user_id=user_id, first_name="B", last_name="Lob", grade_level=6))
+    await db_session.commit()
+
+    result = await db_session.execute(text("SELECT typeof(id), length(id) FROM users"))
+    assert result.one() == ("blob", 16)
+
+    # Foreign keys join on identical bytes
+    result = await db_session.execute(
+        select(User.id, StudentProfile.user_id).join(StudentProfile, StudentProfile.user_id == User.id)
+    )
+    assert result.one() == (user_id, user_id)
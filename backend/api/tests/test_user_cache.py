@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+from uuid import uuid4
+
+from app.core.security import create_access_token
+from app.core.user_cache import TTLCache, user_cache, invalidate_user, listen_for_invalidations
+from app.models.user import User
+
+def test_ttl_cache_expires_entries():
+    now = [0.0]
+    cache = TTLCache(maxsize=10, ttl=5, clock=lambda: now[0])
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    now[0] = 5.0
+    assert cache.get("a") is None
+    assert cache.hits.value == 1
+    assert cache.misses.value == 1
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+@pytest.mark.asyncio
+async def test_users_me_served_from_cache(client: AsyncClient, test_user_in_db: User):
+    token = create_access_token(test_user_in_db.id)
+    headers = {"Authorization": f"Bearer {token}"}
+    misses = user_cache.misses.value
+    hits = user_cache.hits.value
+
+    for _ in range(3):
+        response = await client.get("/users/me", headers=headers)
+        assert response.status_code == 200
+
+    assert user_cache.misses.value - misses == 1
+    assert user_cache.hits.value - hits == 2
+
+@pytest.mark.asyncio
+async def test_deactivated_user_locked_out(client: AsyncClient, admin_token: str, test_user_in_db: User):
+    token = create_access_token(test_user_in_db.id)
+    response = await client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+
+    response = await client.put(
+        f"/users/{test_user_in_db.id}",
+        json={"is_active": False},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+
+    response = await client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_invalidation_broadcast_reaches_listener(redis):
+    user_id = uuid4()
+    listener = asyncio.create_task(listen_for_invalidations(redis))
+    try:
+        await asyncio.sleep(0.05)
+        user_cache.set(user_id, "cached")
+        # Simulate the write happening on another worker
+        await redis.publish("user-cache:invalidate", str(user_id))
+        for _ in range(50):
+            if user_cache.get(user_id) is None:
+                break
+            await asyncio.sleep(0.01)
+        assert user_cache.get(user_id) is None
+    finally:
+        listener.cancel()
+
+@pytest.mark.asyncio
+async def test_invalidate_user_evicts_locally(redis):
+    user_id = uuid4()
+    user_cache.set(user_id, "cached")
+    await invalidate_user(redis, user_id)
+    assert user_cache.get(user_id) is None
@@ -2,15 +2,20 @@ import pytest
 import pytest_asyncio
 from httpx import AsyncClient
 from uuid import uuid4
-from sqlalchemy import select
+from sqlalchemy import select, event
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.main import app
 from app.models.user import User
 from app.models.profiles import StudentProfile, TeacherProfile, ParentProfile, AdminProfile
 from app.core.security import create_access_token
+from app.db.loading import select_users_with_profiles
+from app.db.read_models import select_user_with_profile, user_with_profile
+from app.schemas.user import UserWithProfileResponse
+from tests.query_budget import query_budget
 
 @pytest.mark.asyncio
+@query_budget(4)
 async def test_create_student(client: AsyncClient, admin_token: str, student_data: dict):
     response = await client.post(
         "/users/student",
@@ -21,6 +26,7 @@ async def test_create_student(client: AsyncClient, admin_token: str, student_dat
     assert response.json()["email"] == student_data["email"]
 
 @pytest.mark.asyncio
+@query_budget(4)
 async def test_create_teacher(client: AsyncClient, admin_token: str, teacher_data: dict):
     response = await client.post(
         "/users/teacher",
@@ -31,6 +37,52 @@ async def test_create_teacher(client: AsyncClient, admin_token: str, teacher_dat
     assert response.json()["email"] == teacher_data["email"]
 
 @pytest.mark.asyncio
+@query_budget(4)
+async def test_create_student_conflict(client: AsyncClient, admin_token: str, student_data: dict, db_session: AsyncSession):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    assert (await client.post("/users/student", json=student_data, headers=headers)).status_code == 201
+
+    response = await client.post("/users/student", json=student_data, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username already registered"
+
+    response = await client.post(
+        "/users/student",
+        json={**student_data, "username": "other_student"},
+        headers=headers
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"
+
+    result = await db_session.execute(select(StudentProfile))
+    assert len(result.scalars().all()) == 1
+
+@pytest.mark.asyncio
+@query_budget(16, allow_repeats=True)
+async def test_create_students_batch(client: AsyncClient, admin_token: str, student_data: dict, db_session: AsyncSession):
+    items = [
+        student_data,
+        {**student_data, "username": "second", "email": "second@school.edu"},
+        {**student_data, "email": "third@school.edu"},
+    ]
+    response = await client.post(
+        "/users/students:batch",
+        json=items,
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert results[0]["user"]["username"] == student_data["username"]
+    assert results[1]["user"]["username"] == "second"
+    assert results[2]["user"] is None
+    assert results[2]["error"] == "Username already registered"
+
+    result = await db_session.execute(select(StudentProfile))
+    assert len(result.scalars().all()) == 2
+
+@pytest.mark.asyncio
+@query_budget(2)
 async def test_get_user_profile(client: AsyncClient, admin_token: str, db_session: AsyncSession):
     # Create a test user
     user_id = uuid4()
@@ -59,8 +111,12 @@ async def test_get_user_profile(client: AsyncClient, admin_token: str, db_sessio
     )
     assert response.status_code == 200
     assert response.json()["email"] == "test@example.com"
+    profile = response.json()["profile"]
+    assert profile["type"] == "student"
+    assert profile["grade_level"] == 6
 
 @pytest.mark.asyncio
+@query_budget(3)
 async def test_update_user_profile(client: AsyncClient, admin_token: str, db_session: AsyncSession):
     # Create a test user
     user_id = uuid4()
@@ -100,6 +156,7 @@ async def test_update_user_profile(client: AsyncClient, admin_token: str, db_ses
     assert response.json()["email"] == "new.email@school.edu"
 
 @pytest.mark.asyncio
+@query_budget(4)
 async def test_delete_user(client: AsyncClient, admin_token: str, db_session: AsyncSession):
     # Create a test user
     user_id = uuid4()
@@ -138,6 +195,7 @@ async def test_invalid_token(client: AsyncClient):
     assert response.status_code == 401
 
 @pytest.mark.asyncio
+@query_budget(2)
 async def test_read_users_me(client: AsyncClient, test_user_in_db: User):
     token = create_access_token(test_user_in_db.id)
     response = await client.get(
@@ -148,6 +206,7 @@ async def test_read_users_me(client: AsyncClient, test_user_in_db: User):
     assert response.json()["email"] == test_user_in_db.email
 
 @pytest.mark.asyncio
+@query_budget(2)
 async def test_read_user_by_id(client: AsyncClient, admin_token: str, test_user_in_db: User):
     response = await client.get(
         f"/users/{test_user_in_db.id}",
@@ -157,6 +216,7 @@ async def test_read_user_by_id(client: AsyncClient, admin_token: str, test_user_
     assert response.json()["email"] == test_user_in_db.email
 
 @pytest.mark.asyncio
+@query_budget(2)
 async def test_read_user_not_found(client: AsyncClient, admin_token: str):
     non_existent_id = uuid4()
     response = await client.get(
@@ -175,6 +235,7 @@ async def test_read_user_unauthorized(client: AsyncClient, test_user_in_db: User
     assert response.status_code == 403
 
 @pytest.mark.asyncio
+@query_budget(3)
 async def test_update_user(client: AsyncClient, admin_token: str, test_user_in_db: User):
     update_data = {
         "email": "updated@example.com"
@@ -185,4 +246,242 @@ async def test_update_user(client: AsyncClient, admin_token: str, test_user_in_d
         headers={"Authorization": f"Bearer {admin_token}"}
     )
     assert response.status_code == 200
-    assert response.json()["email"] == "updated@example.com" 
\ No newline at end of file
+    assert response.json()["email"] == "updated@example.com" 
+
+@pytest.mark.asyncio
+async def test_delete_user_requires_admin(client: AsyncClient, test_user_in_db: User):
+    token = create_access_token(test_user_in_db.id)
+    response = await client.delete(
+        f"/users/{test_user_in_db.id}",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_admin_role_check_adds_no_queries(client: AsyncClient, admin_token: str, test_user_in_db: User, db_session: AsyncSession):
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        # First request resolves user and role together, second is served from cache
+        await client.get(f"/users/{test_user_in_db.id}", headers=headers)
+        assert len(statements) == 2
+        statements.clear()
+        response = await client.get(f"/users/{test_user_in_db.id}", headers=headers)
+        # Only the profile read itself; the admin check made no admin_profiles lookup
+        assert len(statements) == 1
+        assert statements[0].lstrip().startswith("SELECT users.id")
+        assert "FROM users LEFT OUTER JOIN profiles" in statements[0]
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+@query_budget(2)
+async def test_read_users_me_includes_typed_profile(client: AsyncClient, admin_token: str):
+    response = await client.get(
+        "/users/me",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+    profile = response.json()["profile"]
+    assert profile["type"] == "admin"
+    assert profile["department"] == "IT"
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["joined", "selectin"])
+async def test_profile_loading_modes(db_session: AsyncSession, mode: str):
+    user_id = uuid4()
+    db_session.add(User(id=user_id, username="teach", email="teach@example.com", hashed_password="hashed"))
+    db_session.add(TeacherProfile(user_id=user_id, first_name="T", last_name="R", subject="Art", room_number="3"))
+    await db_session.commit()
+    db_session.expunge_all()
+
+    result = await db_session.execute(select_users_with_profiles(mode).filter(User.id == user_id))
+    user = result.unique().scalar_one()
+    assert isinstance(user.profile, TeacherProfile)
+    assert user.profile.subject == "Art"
+
+@pytest.mark.asyncio
+async def test_read_model_matches_orm_path(db_session: AsyncSession):
+    profiles = [
+        StudentProfile(first_name="S", last_name="T", grade_level=7, has_iep=True, accommodations={"time": "extra"}),
+        TeacherProfile(first_name="T", last_name="R", subject="Art", room_number="3"),
+        ParentProfile(first_name="P", last_name="A"),
+        AdminProfile(first_name="A", last_name="D", department="IT"),
+    ]
+    user_ids = []
+    for i, profile in enumerate(profiles):
+        user_id = uuid4()
+        user_ids.append(user_id)
+        db_session.add(User(id=user_id, username=f"reader{i}", email=f"reader{i}@example.com", hashed_password="x"))
+        profile.user_id = user_id
+        db_session.add(profile)
+    db_session.add(User(id=uuid4(), username="noprofile", email="noprofile@example.com", hashed_password="x"))
+    await db_session.commit()
+    db_session.expunge_all()
+
+    users = (await db_session.execute(select_users_with_profiles())).unique().scalars().all()
+    rows = (await db_session.execute(select_user_with_profile())).all()
+    assert len(rows) == len(users)
+    expected = {user.id: UserWithProfileResponse.model_validate(user).model_dump() for user in users}
+    actual = {row.id: user_with_profile(row).model_dump() for row in rows}
+    assert actual == expected
+
+@pytest.mark.asyncio
+@query_budget(2)
+async def test_list_users_keyset_pages(client: AsyncClient, admin_token: str, db_session: AsyncSession):
+    for i in range(5):
+        user_id = uuid4()
+        db_session.add(User(id=user_id, username=f"student{i}", email=f"student{i}@school.edu", hashed_password="x"))
+        db_session.add(StudentProfile(user_id=user_id, first_name="S", last_name=str(i), grade_level=6 + i % 2))
+    await db_session.commit()
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    usernames, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/users", params=params, headers=headers)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        usernames += [item["username"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert usernames == ["admin"] + [f"student{i}" for i in range(5)]
+
+    response = await client.get("/users", params={"type": "student", "grade_level": 7}, headers=headers)
+    assert [item["username"] for item in response.json()["items"]] == ["student1", "student3"]
+
+    response = await client.get("/users", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+@query_budget(2)
+async def test_list_users_teacher_sees_students_only(client: AsyncClient, db_session: AsyncSession):
+    teacher_id, student_id = uuid4(), uuid4()
+    db_session.add(User(id=teacher_id, username="teacher", email="teacher@school.edu", hashed_password="x", is_active=True))
+    db_session.add(TeacherProfile(user_id=teacher_id, first_name="T", last_name="T", subject="ELA", room_number="1"))
+    db_session.add(User(id=student_id, username="student", email="student@school.edu", hashed_password="x", is_active=True))
+    db_session.add(StudentProfile(user_id=student_id, first_name="S", last_name="S", grade_level=6))
+    await db_session.commit()
+
+    headers = {"Authorization": f"Bearer {create_access_token(teacher_id)}"}
+    response = await client.get("/users", headers=headers)
+    assert response.status_code == 200
+    assert [item["username"] for item in response.json()["items"]] == ["student"]
+
+    response = await client.get("/users", params={"type": "admin"}, headers=headers)
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_read_users_me_etag(client: AsyncClient, admin_token: str, query_counter):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await client.get("/users/me", headers=headers)
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    response = await client.get("/users/me", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    # Served from the resolved user's version stamp without touching the database
+    assert query_counter.requests[-1][1] == []
+
+    user_id = response.headers["etag"].strip('"').split("-")[0]
+    response = await client.put(f"/users/{user_id}", json={"email": "new@example.com"}, headers=headers)
+    assert response.status_code == 200
+
+    response = await client.get("/users/me", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["email"] == "new@example.com"
+
+@pytest.mark.asyncio
+@query_budget(2)
+async def test_read_user_etag(client: AsyncClient, admin_token: str, test_user_in_db: User):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await client.get(f"/users/{test_user_in_db.id}", headers=headers)
+    etag = response.headers["etag"]
+
+    response = await client.get(f"/users/{test_user_in_db.id}", headers={**headers, "If-None-Match": f"W/{etag}"})
+    assert response.status_code == 304
+
+    response = await client.get(f"/users/{test_user_in_db.id}", headers={**headers, "If-None-Match": '"stale"'})
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_read_user_sparse_fields(client: AsyncClient, admin_token: str, db_session: AsyncSession, query_counter):
+    user_id = uuid4()
+    db_session.add(User(id=user_id, username="iep", email="iep@school.edu", hashed_password="x"))
+    db_session.add(StudentProfile(
+        user_id=user_id, first_name="I", last_name="P", grade_level=8,
+        has_iep=True, iep_summary="summary", accommodations={"time": "extra"}
+    ))
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    # Heavy IEP columns are neither fetched nor returned unless named
+    response = await client.get(f"/users/{user_id}", headers=headers)
+    assert response.status_code == 200
+    profile = response.json()["profile"]
+    assert profile["grade_level"] == 8 and profile["has_iep"] is True
+    assert "accommodations" not in profile and "iep_summary" not in profile
+    assert "accommodations" not in query_counter.requests[-1][1][-1]
+
+    response = await client.get(
+        f"/users/{user_id}",
+        params={"fields": "username,profile.grade_level,profile.accommodations"},
+        headers=headers
+    )
+    assert response.json() == {
+        "username": "iep",
+        "profile": {"type": "student", "grade_level": 8, "accommodations": {"time": "extra"}},
+    }
+    assert "teacher_profiles" not in query_counter.requests[-1][1][-1]
+
+    response = await client.get(f"/users/{user_id}", params={"fields": "username"}, headers=headers)
+    assert response.json() == {"username": "iep"}
+    assert "profiles" not in query_counter.requests[-1][1][-1]
+
+    response = await client.get(f"/users/{user_id}", params={"fields": "password"}, headers=headers)
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_list_users_fields(client: AsyncClient, admin_token: str, db_session: AsyncSession):
+    teacher_id, student_id = uuid4(), uuid4()
+    db_session.add(User(id=teacher_id, username="teacher", email="teacher@school.edu", hashed_password="x"))
+    db_session.add(TeacherProfile(user_id=teacher_id, first_name="T", last_name="T", subject="ELA", room_number="1"))
+    db_session.add(User(id=student_id, username="student", email="student@school.edu", hashed_password="x"))
+    db_session.add(StudentProfile(user_id=student_id, first_name="S", last_name="S", grade_level=6, iep_goals={"read": 1}))
+    await db_session.commit()
+
+    # Teachers get a roster by default
+    headers = {"Authorization": f"Bearer {create_access_token(teacher_id)}"}
+    response = await client.get("/users", headers=headers)
+    assert set(response.json()["items"][0]) == {"id", "username", "first_name", "last_name", "grade_level", "has_iep"}
+
+    response = await client.get("/users", params={"fields": "last_name,has_iep", "limit": 1}, headers=headers)
+    page = response.json()
+    assert page["items"] == [{"last_name": "S", "has_iep": False}]
+    assert page["next_cursor"] is None
+
+    # IEP details are for admins only
+    for field in ("iep_summary", "accommodations", "iep_goals"):
+        response = await client.get("/users", params={"fields": f"last_name,{field}"}, headers=headers)
+        assert response.status_code == 403
+
+    response = await client.get(
+        "/users",
+        params={"fields": "last_name,iep_goals", "type": "student"},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.json()["items"] == [{"last_name": "S", "iep_goals": {"read": 1}}]
+
+    response = await client.get("/users", params={"fields": "profile.first_name"}, headers=headers)
+    assert response.status_code == 400